@@ -2,78 +2,75 @@
 Butler Agent - Single agent with direct tool access.
 No sub-agents, flat architecture for simplicity and speed.
 """
-from agentscope.agent import ReActAgent
-from agentscope.model import OpenAIChatModel
+import asyncio
+import functools
+import re
+import time
+import weakref
+from collections import OrderedDict
+from typing import AsyncIterator
+
+import httpx
 from agentscope.formatter import OpenAIChatFormatter
 from agentscope.memory import InMemoryMemory
 from agentscope.tool import Toolkit
 from agentscope.message import Msg
+from agentscope.pipeline import stream_printing_messages
+
+from .react_agent import SingleTurnReActAgent
 
-from config import OPENAI_API_KEY, OPENAI_BASE_URL, MODEL_NAME
+from bootstrap import HTTP_CLIENT, get_model
+from config import OPENAI_BASE_URL
 from core.state_manager import state_manager
 from core.schedule_manager import schedule_manager
 from core.rule_engine import rule_engine
+from core.async_runtime import run_sync
 
 # Import all tools directly
 from tools.device_tools import control_light, control_ac, control_speaker, get_device_status
-from tools.schedule_tools import create_reminder, create_device_schedule, list_schedules, cancel_schedule
-from tools.search_tools import web_search, search_news
+from tools.schedule_tools import (
+    create_reminder, create_device_schedule, create_reminders_batch, create_device_schedules_batch,
+    list_schedules, cancel_schedule,
+)
+from tools.search_tools import web_search, search_news, web_and_news_search
 
+_PREWARM_CONNECTIONS = 4
+MAX_SESSIONS = 256  # Conversations kept in memory; the least recently used is dropped beyond this
 
-class ButlerAgent:
+
+async def _prewarm():
+    """Open keep-alive connections to the model endpoint ahead of the first chat."""
+    try:
+        await asyncio.gather(*(
+            HTTP_CLIENT.head(OPENAI_BASE_URL) for _ in range(_PREWARM_CONNECTIONS)
+        ))
+    except httpx.HTTPError:
+        pass  # Best effort: the first chat() will connect normally
+
+
+def _offload(func):
     """
-    Butler is a single smart home assistant that:
-    1. Understands user requests (commands, questions, ambiguous expressions)
-    2. Calls tools directly to perform actions
-    3. Responds naturally to the user
+    Wrap a blocking tool so the toolkit awaits it in a worker thread.
+    ReActAgent gathers the tool calls of one step (parallel_tool_calls=True),
+    but a sync tool blocks the loop and serializes them.
     """
+    @functools.wraps(func)
+    async def wrapper(*args, **kwargs):
+        return await asyncio.to_thread(func, *args, **kwargs)
+    return wrapper
 
-    def __init__(self):
-        self.toolkit = Toolkit()
-        self._register_tools()
-        self.agent = self._create_agent()
-
-    def _register_tools(self):
-        """Register all tools directly."""
-        # Device control tools
-        self.toolkit.register_tool_function(control_light)
-        self.toolkit.register_tool_function(control_ac)
-        self.toolkit.register_tool_function(control_speaker)
-        self.toolkit.register_tool_function(get_device_status)
-        # Schedule tools
-        self.toolkit.register_tool_function(create_reminder)
-        self.toolkit.register_tool_function(create_device_schedule)
-        self.toolkit.register_tool_function(list_schedules)
-        self.toolkit.register_tool_function(cancel_schedule)
-        # Search tools
-        self.toolkit.register_tool_function(web_search)
-        self.toolkit.register_tool_function(search_news)
-
-    def _create_agent(self) -> ReActAgent:
-        model = OpenAIChatModel(
-            model_name=MODEL_NAME,
-            api_key=OPENAI_API_KEY,
-            client_args={"base_url": OPENAI_BASE_URL},
-            stream=False,
-        )
-        return ReActAgent(
-            name="Butler",
-            sys_prompt=self._build_prompt(),
-            model=model,
-            formatter=OpenAIChatFormatter(),
-            toolkit=self.toolkit,
-            memory=InMemoryMemory(),
-            parallel_tool_calls=True,
-        )
 
-    def _build_prompt(self) -> str:
-        device_ctx = state_manager.get_context()
-        schedule_ctx = schedule_manager.get_context()
-        return f"""You are Butler, a smart home assistant.
+# Tool groups registered on every butler
+DEVICE_TOOLS = (control_light, control_ac, control_speaker, get_device_status)
+SCHEDULE_TOOLS = (
+    create_reminder, create_device_schedule, create_reminders_batch, create_device_schedules_batch,
+    list_schedules, cancel_schedule,
+)
+# Network-bound, run off the event loop (the combined search is async itself)
+SEARCH_TOOLS = (_offload(web_search), _offload(search_news), web_and_news_search)
 
-{device_ctx}
 
-{schedule_ctx}
+STATIC_PROMPT = """You are Butler, a smart home assistant.
 
 You have direct access to tools for device control, scheduling, and web search.
 
@@ -87,16 +84,18 @@ Available tools:
 - Scheduling:
   - create_reminder(message, time, repeat): Set reminders
   - create_device_schedule(description, time, device_type, room, action, repeat): Schedule device actions
+  - create_reminders_batch(items) / create_device_schedules_batch(items): Several at once (JSON list)
   - list_schedules(): Show all scheduled tasks
   - cancel_schedule(task_id): Cancel a task
 
 - Search:
   - web_search(query): Search the web
   - search_news(query): Search news articles
+  - web_and_news_search(query): Web and news results in one call, when both are useful
 
 Guidelines:
 - For device commands, call the appropriate control tool directly
-- For status questions, check the context above first; use tools only if needed
+- For status questions, check the latest system_state message first; use tools only if needed
 - For reminders/schedules, use the scheduling tools
 - For information queries (weather, news, questions), use search tools
 - Handle ambiguous comfort requests by inferring the action:
@@ -107,17 +106,240 @@ Guidelines:
 - Respond naturally in the same language as the user
 - Be concise but friendly
 """
+# Separator between the device and schedule blocks of the state message
+_STATE_SEP = "\n\n"
+
+
+# Replies to repeated read-only questions are reused while nothing has changed
+_RESPONSE_CACHE_TTL = 60.0  # seconds; bounds staleness of search answers
+_RESPONSE_CACHE_SIZE = 512
+# Requests that may act on devices or schedules are never answered from cache
+_MUTATING = re.compile(
+    r"\b(turn|switch|set|dim|brighten|play|pause|stop|resume|remind|schedule|cancel|delete|"
+    r"open|close|raise|lower|increase|decrease|too|make)\b",
+    re.I,
+)
+# Follow-ups that lean on earlier turns ("why?", "and tomorrow?", "is it on?") are
+# never answered from cache: the same words can mean something else in another turn
+_CONTEXTUAL = re.compile(
+    r"^(?:and|but|so|also|then|why|how come|what about)\b"
+    r"|\b(?:it|its|that|this|these|those|they|them|their|there|he|she|him|her|"
+    r"again|else|more|instead|same|previous|earlier|before|above)\b",
+    re.I,
+)
+
+
+def _normalize_query(text: str) -> str:
+    """Case, spacing and trailing punctuation do not change the question."""
+    return " ".join(text.lower().split()).rstrip("?!.")
+
+
+class ButlerAgent:
+    """
+    Butler is a single smart home assistant that:
+    1. Understands user requests (commands, questions, ambiguous expressions)
+    2. Calls tools directly to perform actions
+    3. Responds naturally to the user
+    """
 
-    async def chat(self, user_input: str) -> str:
+    _prewarmed = False
+    _prewarm_task: asyncio.Task | None = None
+    _toolkit: Toolkit | None = None  # Shared by all instances, built once
+
+    def __init__(self, parallel_tool_calls: bool = True):
+        # Run the independent tool calls of one model step concurrently
+        # (latency max(t_i) instead of sum(t_i)); False runs them in order.
+        self.parallel_tool_calls = parallel_tool_calls
+        self._state_cache: tuple[int, int, str] | None = None  # (state ver, schedule ver, text)
+        # Memory -> versions of the last state message added to it
+        self._state_sent: weakref.WeakKeyDictionary = weakref.WeakKeyDictionary()
+        # Session id -> that conversation's agent. Agents are cheap (model and toolkit
+        # are shared), and agentscope keeps per-call state (reply task, message
+        # queue) on the agent, so one agent per conversation keeps sessions apart.
+        # Session ids come from clients, so the table is bounded: least recently used first.
+        self._sessions: OrderedDict[str, SingleTurnReActAgent] = OrderedDict()
+        # (session id, state ver, schedule ver, input) -> (expiry, reply); insertion order is age
+        self._response_cache: dict[tuple[str | None, int, int, str], tuple[float, str]] = {}
+        self.toolkit = self._register_tools()
+        self._schedule_prewarm()
+
+    @functools.cached_property
+    def agent(self) -> SingleTurnReActAgent:
+        """LLM agent, built on first use so rule-engine-only sessions never pay for it."""
+        return self._create_agent()
+
+    @classmethod
+    def _schedule_prewarm(cls):
+        """Warm the LLM connection pool once per process, in the background."""
+        if cls._prewarmed:
+            return
+        try:
+            loop = asyncio.get_running_loop()
+        except RuntimeError:
+            return  # No loop yet (sync usage); connect lazily instead
+        cls._prewarmed = True
+        cls._prewarm_task = loop.create_task(_prewarm())
+
+    @classmethod
+    def _register_tools(cls) -> Toolkit:
+        """
+        Register all tools directly.
+        Schema introspection runs once per class; later instances (e.g. after
+        /reset) reuse the same read-only toolkit.
+        """
+        if cls.__dict__.get("_toolkit") is None:
+            toolkit = Toolkit()
+            for tool in (*DEVICE_TOOLS, *SCHEDULE_TOOLS, *SEARCH_TOOLS):
+                toolkit.register_tool_function(tool)
+            cls._toolkit = toolkit
+        return cls._toolkit
+
+    def _agent_for(self, session_id: str | None) -> SingleTurnReActAgent:
+        """The agent holding a session's conversation; no session id means the default one."""
+        if session_id is None:
+            return self.agent
+        sessions = self._sessions
+        agent = sessions.get(session_id)
+        if agent is not None:
+            sessions.move_to_end(session_id)
+            return agent
+        agent = sessions[session_id] = self._create_agent()
+        if len(sessions) > MAX_SESSIONS:
+            sessions.popitem(last=False)  # Its memory goes with it (_state_sent is weak)
+        return agent
+
+    def _create_agent(self, memory: InMemoryMemory | None = None) -> SingleTurnReActAgent:
+        """A new agent over the shared model and toolkit, with its own memory unless one is given."""
+        return SingleTurnReActAgent(
+            name="Butler",
+            sys_prompt=STATIC_PROMPT,
+            model=get_model(),
+            formatter=OpenAIChatFormatter(),
+            toolkit=self.toolkit,
+            memory=memory if memory is not None else InMemoryMemory(),
+            parallel_tool_calls=self.parallel_tool_calls,
+        )
+
+    def _get_state(self) -> str:
+        """Return the device/schedule context, rebuilding it only when either changed."""
+        versions = (state_manager.version, schedule_manager.version)
+        cache = self._state_cache
+        if cache is None or cache[:2] != versions:
+            text = "".join((state_manager.get_context(), _STATE_SEP, schedule_manager.get_context()))
+            cache = self._state_cache = (*versions, text)
+        return cache[2]
+
+    def _turn(self, agent: SingleTurnReActAgent, user_input: str) -> list[Msg]:
+        """
+        Messages for one turn.
+        The system prompt never changes, so providers can reuse its cached
+        prefill; live state goes into a separate message, and only when it
+        changed since the last one this conversation saw.
+        """
+        msgs = [Msg(name="user", content=user_input, role="user")]
+        versions = (state_manager.version, schedule_manager.version)
+        memory = agent.memory
+        if self._state_sent.get(memory) != versions:
+            msgs.insert(0, Msg(name="system_state", content=self._get_state(), role="user"))
+            self._state_sent[memory] = versions
+        return msgs
+
+    async def chat(self, user_input: str, session_id: str | None = None) -> str:
+        """
+        Answer one utterance.
+        With a session_id the reply comes from that session's own agent, so
+        many users can talk to one butler without sharing history.
+        """
         # Layer 1: Try rule engine first (fast path)
-        rule_result = rule_engine.process(user_input)
+        rule_result = await rule_engine.process(user_input)
+        if rule_result.matched:
+            return rule_result.response
+
+        # Layer 2: Reuse a recent answer to the same question in the same state
+        agent = self._agent_for(session_id)
+        key = self._cache_key(session_id, user_input)
+        if key is not None:
+            cached = self._response_cache.get(key)
+            if cached is not None and cached[0] > time.monotonic():
+                # Record the turn as if the model had answered, so follow-ups keep their context
+                await agent.memory.add([*self._turn(agent, user_input), Msg(agent.name, cached[1], "assistant")])
+                return cached[1]
+
+        # Layer 3: Fall back to LLM agent
+        response = await self._ask(agent, user_input)
+        if key is not None:
+            self._cache_response(key, response)
+        return response
+
+    @staticmethod
+    def _cache_key(session_id: str | None, user_input: str) -> tuple[str | None, int, int, str] | None:
+        """
+        Cache key for a self-contained read-only question, or None if the reply
+        must not be cached.
+        """
+        text = user_input.strip()
+        if _MUTATING.search(text) or _CONTEXTUAL.search(text):
+            return None
+        # The state the model sees is fully determined by the two versions
+        return session_id, state_manager.version, schedule_manager.version, _normalize_query(text)
+
+    def _cache_response(self, key: tuple[str | None, int, int, str], response: str):
+        cache = self._response_cache
+        cache.pop(key, None)
+        if len(cache) >= _RESPONSE_CACHE_SIZE:
+            del cache[next(iter(cache))]  # Evict the oldest entry
+        cache[key] = (time.monotonic() + _RESPONSE_CACHE_TTL, response)
+
+    async def chat_stream(self, user_input: str, session_id: str | None = None) -> AsyncIterator[str]:
+        """Yield the reply text incrementally as the model generates it."""
+        rule_result = await rule_engine.process(user_input)
+        if rule_result.matched:
+            yield rule_result.response
+            return
+
+        # The message queue lives on the agent and is replaced per stream: stream on
+        # a per-call agent over the session's memory so concurrent calls never share it
+        agent = self._create_agent(self._agent_for(session_id).memory)
+        reply = asyncio.create_task(self._run(agent, user_input))
+
+        async def wait_reply() -> Msg:
+            return await reply
+
+        sent: dict[str, int] = {}  # msg id -> characters already yielded
+        try:
+            async for chunk, _ in stream_printing_messages(agents=[agent], coroutine_task=wait_reply()):
+                if chunk.role != "assistant":
+                    continue  # Tool results
+                text = chunk.get_text_content() or ""
+                start = sent.get(chunk.id, 0)
+                if len(text) > start:
+                    delta = text[start:]
+                    if start == 0 and sent:
+                        delta = "\n" + delta  # Separate text from successive reasoning steps
+                    sent[chunk.id] = len(text)
+                    yield delta
+        finally:
+            # Closed early (client disconnected) or failed: stop the agent, nobody reads its output
+            if not reply.done():
+                reply.cancel()
+            agent.set_msg_queue_enabled(False)
+
+    async def chat_batch(self, inputs: list[str]) -> list[str]:
+        """
+        Answer several independent utterances concurrently.
+        Each one runs on its own short-lived agent (fresh memory, shared model
+        and toolkit), so their conversations never interleave.
+        """
+        return list(await asyncio.gather(*(self._chat_isolated(x) for x in inputs)))
+
+    async def _chat_isolated(self, user_input: str) -> str:
+        rule_result = await rule_engine.process(user_input)
         if rule_result.matched:
             return rule_result.response
+        return await self._ask(self._create_agent(), user_input)
 
-        # Layer 2: Fall back to LLM agent
-        self.agent._sys_prompt = self._build_prompt()
-        msg = Msg(name="user", content=user_input, role="user")
-        response = await self.agent(msg)
+    async def _ask(self, agent: SingleTurnReActAgent, user_input: str) -> str:
+        response = await self._run(agent, user_input)
 
         if hasattr(response, 'get_text_content'):
             return response.get_text_content()
@@ -125,9 +347,22 @@ Guidelines:
             return response.content
         return str(response)
 
-    def chat_sync(self, user_input: str) -> str:
-        import asyncio
-        return asyncio.run(self.chat(user_input))
+    async def _run(self, agent: SingleTurnReActAgent, user_input: str) -> Msg:
+        return await agent(self._turn(agent, user_input))
+
+    def chat_sync(self, user_input: str, session_id: str | None = None) -> str:
+        return run_sync(self.chat(user_input, session_id))
+
+    async def clear_memory(self, session_id: str | None = None):
+        if session_id is not None:
+            agent = self._sessions.pop(session_id, None)
+        else:
+            agent = self.__dict__.get("agent")  # Nothing to clear if never instantiated
+        if agent is not None:
+            await agent.memory.clear()
+            self._state_sent.pop(agent.memory, None)  # Next turn resends the state
 
-    def clear_memory(self):
-        self.agent.memory = InMemoryMemory()
+    async def reset(self):
+        """Forget every conversation and cached reply, keeping the default agent, model and toolkit."""
+        await asyncio.gather(self.clear_memory(), *(self.clear_memory(sid) for sid in list(self._sessions)))
+        self._response_cache.clear()
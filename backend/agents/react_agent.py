@@ -0,0 +1,80 @@
+"""
+Single-turn ReAct agent.
+Skips the follow-up model call when the tools already produced the answer.
+"""
+from contextvars import ContextVar
+
+from agentscope.agent import ReActAgent
+from agentscope.message import Msg
+
+# Tools whose output is already a complete, user-facing confirmation
+DIRECT_REPLY_TOOLS = frozenset({"control_light", "control_ac", "control_speaker"})
+
+# Tool call id -> output for the pending direct reply of the current request
+_direct_reply: ContextVar[dict[str, str] | None] = ContextVar("direct_reply", default=None)
+
+
+class SingleTurnReActAgent(ReActAgent):
+    """
+    ReActAgent that answers device commands with a single completion.
+
+    The model returns text and tool_calls in one response (tool_choice=auto).
+    When every tool call in that response is a device-control tool, the
+    tool outputs are returned as the reply instead of asking the model to
+    narrate them in a second round trip.
+
+    Relies on ReActAgent.reply leaving its loop after a text-only reasoning
+    message, which older agentscope releases (e.g. 1.0.6) do not do; hence
+    the agentscope>=1.0.21 floor in requirements.txt.
+    """
+
+    def __init__(self, *args, direct_reply_tools=DIRECT_REPLY_TOOLS, **kwargs):
+        super().__init__(*args, **kwargs)
+        self.direct_reply_tools = frozenset(direct_reply_tools)
+
+    async def reply(self, *args, **kwargs) -> Msg:
+        # Runs in the caller's task: keep the pending direct reply scoped to this call
+        token = _direct_reply.set(None)
+        try:
+            return await super().reply(*args, **kwargs)
+        finally:
+            _direct_reply.reset(token)
+
+    async def _reasoning(self, *args, **kwargs) -> Msg:
+        direct_reply = _direct_reply.get()
+        if direct_reply is not None:
+            # Previous step only ran device tools: reply with their results
+            text = "\n".join(t for t in direct_reply.values() if t)
+            _direct_reply.set(None)
+            msg = Msg(self.name, text, "assistant")
+            await self.memory.add(msg)
+            await self.print(msg, True)
+            return msg
+
+        msg = await super()._reasoning(*args, **kwargs)
+        tool_calls = msg.get_content_blocks("tool_use")
+        if tool_calls and all(tc["name"] in self.direct_reply_tools for tc in tool_calls):
+            # Keep call order; _acting fills in the outputs
+            # (the dict is shared with the tool tasks, which copy the context)
+            _direct_reply.set({tc["id"]: "" for tc in tool_calls})
+        return msg
+
+    async def _acting(self, tool_call):
+        result = await super()._acting(tool_call)
+        direct_reply = _direct_reply.get()
+        if direct_reply is not None and tool_call["id"] in direct_reply:
+            direct_reply[tool_call["id"]] = await self._tool_output(tool_call["id"])
+        return result
+
+    async def _tool_output(self, tool_call_id: str) -> str:
+        """Find the text output recorded in memory for a tool call."""
+        for msg in reversed(await self.memory.get_memory()):
+            if not isinstance(msg.content, list):
+                continue
+            for block in msg.content:
+                if block.get("type") == "tool_result" and block.get("id") == tool_call_id:
+                    output = block.get("output")
+                    if isinstance(output, str):
+                        return output
+                    return "".join(b.get("text", "") for b in output or [] if b.get("type") == "text")
+        return ""
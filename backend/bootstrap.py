@@ -0,0 +1,83 @@
+"""
+Bootstrap - One-time process initialization.
+Called explicitly by the entrypoint so importing config or any module has no side effects.
+"""
+import functools
+import logging
+import logging.handlers
+import queue
+
+import agentscope
+import httpx
+from agentscope.model import OpenAIChatModel
+
+from config import AGENTSCOPE_INIT_KWARGS, OPENAI_API_KEY, OPENAI_BASE_URL, MODEL_NAME
+
+# One pooled HTTP client shared by every model instance, so follow-up turns
+# reuse keep-alive connections instead of paying a fresh TCP/TLS handshake.
+HTTP_CLIENT = httpx.AsyncClient(
+    http2=True,
+    limits=httpx.Limits(
+        max_keepalive_connections=20,
+        max_connections=100,
+        keepalive_expiry=30,
+    ),
+)
+
+_initialized = False
+_log_handler: logging.handlers.QueueHandler | None = None
+_log_listener: logging.handlers.QueueListener | None = None
+
+
+def init_agentscope():
+    """Initialize the AgentScope SDK once per process."""
+    global _initialized
+    if _initialized:
+        return
+    agentscope.init(**AGENTSCOPE_INIT_KWARGS)
+    _initialized = True
+
+
+def init_logging(level: int = logging.INFO):
+    """
+    Route log records through a queue so emitting never blocks the event loop;
+    a background listener thread does the actual stderr writes.
+    """
+    global _log_handler, _log_listener
+    if _log_listener is not None:
+        return
+    log_queue: queue.SimpleQueue = queue.SimpleQueue()
+    handler = logging.StreamHandler()
+    handler.setFormatter(logging.Formatter("%(asctime)s %(levelname)s %(name)s: %(message)s"))
+    _log_handler = logging.handlers.QueueHandler(log_queue)
+    root = logging.getLogger()
+    root.addHandler(_log_handler)
+    root.setLevel(level)
+    logging.getLogger("httpx").setLevel(logging.WARNING)  # One INFO line per request otherwise
+    _log_listener = logging.handlers.QueueListener(log_queue, handler)
+    _log_listener.start()
+
+
+def stop_logging():
+    """Flush and stop the log listener thread (call on application shutdown)."""
+    global _log_handler, _log_listener
+    if _log_listener is not None:
+        logging.getLogger().removeHandler(_log_handler)
+        _log_listener.stop()
+        _log_handler = _log_listener = None
+
+
+@functools.cache
+def get_model() -> OpenAIChatModel:
+    """The process-wide chat model, created on first use and shared by every agent."""
+    return OpenAIChatModel(
+        model_name=MODEL_NAME,
+        api_key=OPENAI_API_KEY,
+        client_kwargs={"base_url": OPENAI_BASE_URL, "http_client": HTTP_CLIENT},
+        stream=True,
+    )
+
+
+async def close_http_client():
+    """Close the shared LLM HTTP client (call on application shutdown)."""
+    await HTTP_CLIENT.aclose()
@@ -1,32 +1,56 @@
 import os
+from dataclasses import dataclass, field
 from dotenv import load_dotenv
-import agentscope
 
-load_dotenv() 
-
-OPENAI_API_KEY = os.getenv("OPENAI_API_KEY", "")
-OPENAI_BASE_URL = os.getenv("OPENAI_BASE_URL", "https://api.openai.com/v1")
-
-# Switch to vLLM later:
-# OPENAI_BASE_URL = "http://localhost:8000/v1"
-# OPENAI_API_KEY = "not-needed"
-
-MODEL_NAME = os.getenv("MODEL_NAME", "gpt-4o-mini")
+# Read .env once per process (skips the filesystem walk on module reloads)
+if not os.getenv("SETTINGS_LOADED"):
+    load_dotenv()
+    os.environ["SETTINGS_LOADED"] = "1"
+
+
+@dataclass(frozen=True, slots=True)
+class Settings:
+    """Typed settings parsed once from the environment."""
+    openai_api_key: str = field(repr=False)  # Secrets stay out of logs
+    openai_base_url: str
+    model_name: str
+    ha_url: str
+    ha_token: str = field(repr=False)
+    ha_enabled: bool
+    agentscope_studio_url: str
+
+    @classmethod
+    def from_env(cls) -> "Settings":
+        return cls(
+            openai_api_key=os.getenv("OPENAI_API_KEY", ""),
+            # Switch to vLLM later: OPENAI_BASE_URL="http://localhost:8000/v1", OPENAI_API_KEY="not-needed"
+            openai_base_url=os.getenv("OPENAI_BASE_URL", "https://api.openai.com/v1"),
+            model_name=os.getenv("MODEL_NAME", "gpt-4o-mini"),
+            ha_url=os.getenv("HA_URL", "http://localhost:8123"),
+            ha_token=os.getenv("HA_TOKEN", ""),
+            ha_enabled=os.getenv("HA_ENABLED", "false").lower() == "true",
+            agentscope_studio_url=os.getenv("AGENTSCOPE_STUDIO_URL", ""),  # Optional: e.g., "http://localhost:3001"
+        )
+
+
+settings = Settings.from_env()
+
+OPENAI_API_KEY = settings.openai_api_key
+OPENAI_BASE_URL = settings.openai_base_url
+MODEL_NAME = settings.model_name
 
 # Home Assistant Configuration
-HA_URL = os.getenv("HA_URL", "http://localhost:8123")
-HA_TOKEN = os.getenv("HA_TOKEN", "")
-HA_ENABLED = os.getenv("HA_ENABLED", "false").lower() == "true"
+HA_URL = settings.ha_url
+HA_TOKEN = settings.ha_token
+HA_ENABLED = settings.ha_enabled
 
 # AgentScope Configuration
-AGENTSCOPE_STUDIO_URL = os.getenv("AGENTSCOPE_STUDIO_URL", "")  # Optional: e.g., "http://localhost:3001"
+AGENTSCOPE_STUDIO_URL = settings.agentscope_studio_url
 
-# Initialize AgentScope
-_init_kwargs = {
+# AgentScope init arguments (applied by bootstrap.init_agentscope at startup)
+AGENTSCOPE_INIT_KWARGS = {
     "project": "home-assistant",
     "name": "butler-agent",
 }
 if AGENTSCOPE_STUDIO_URL:
-    _init_kwargs["studio_url"] = AGENTSCOPE_STUDIO_URL
-
-agentscope.init(**_init_kwargs)
+    AGENTSCOPE_INIT_KWARGS["studio_url"] = AGENTSCOPE_STUDIO_URL
@@ -2,10 +2,12 @@ from .state_manager import state_manager, StateManager, DeviceState
 from .schedule_manager import schedule_manager, ScheduleManager, ScheduledTask
 from .ha_client import ha_client, HomeAssistantClient
 from .rule_engine import rule_engine, RuleEngine, RuleResult
+from .async_runtime import get_loop, run_sync
 
 __all__ = [
     "state_manager", "StateManager", "DeviceState",
     "schedule_manager", "ScheduleManager", "ScheduledTask",
     "ha_client", "HomeAssistantClient",
     "rule_engine", "RuleEngine", "RuleResult",
+    "get_loop", "run_sync",
 ]
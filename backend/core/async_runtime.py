@@ -0,0 +1,35 @@
+"""
+Async Runtime - One long-lived event loop for synchronous callers.
+Sync entry points submit coroutines here instead of calling asyncio.run(),
+which would build and tear down a loop (and its HTTP connection pools) per call.
+"""
+import asyncio
+import atexit
+import threading
+from typing import Any, Coroutine, TypeVar
+
+T = TypeVar("T")
+
+_loop: asyncio.AbstractEventLoop | None = None
+_loop_lock = threading.Lock()
+
+
+def get_loop() -> asyncio.AbstractEventLoop:
+    """Return the background loop, starting its daemon thread on first use."""
+    global _loop
+    with _loop_lock:
+        if _loop is None:
+            _loop = asyncio.new_event_loop()
+            threading.Thread(target=_loop.run_forever, name="async-runtime", daemon=True).start()
+            atexit.register(_stop_loop)
+        return _loop
+
+
+def run_sync(coro: Coroutine[Any, Any, T]) -> T:
+    """Run a coroutine on the background loop and block until it finishes."""
+    return asyncio.run_coroutine_threadsafe(coro, get_loop()).result()
+
+
+def _stop_loop():
+    if _loop is not None:
+        _loop.call_soon_threadsafe(_loop.stop)
@@ -1,18 +1,39 @@
 """Home Assistant API Client."""
-import requests
+import asyncio
+import functools
+import logging
+
+import httpx
 from typing import Any
 from config import HA_URL, HA_TOKEN, HA_ENABLED
 
+logger = logging.getLogger(__name__)
+
 
 class HomeAssistantClient:
     """Client for interacting with Home Assistant REST API."""
 
+    BATCH_WINDOW = 0.02  # seconds acall_service_batched waits for identical calls to merge
+
     def __init__(self):
         self.base_url = HA_URL.rstrip("/")
         self.headers = {
             "Authorization": f"Bearer {HA_TOKEN}",
             "Content-Type": "application/json",
         }
+        # Pooled keep-alive clients: no new TCP/TLS handshake per service call
+        client_args = dict(
+            base_url=self.base_url,
+            headers=self.headers,
+            timeout=10,
+            limits=httpx.Limits(max_keepalive_connections=8),
+        )
+        self._client = httpx.Client(**client_args)
+        self._aclient = httpx.AsyncClient(**client_args)
+        # (domain, service, data) -> (entity ids, result future, flush task)
+        self._batches: dict[tuple, tuple[list[str], asyncio.Future, asyncio.Task]] = {}
+        # Flush tasks still running, so they are not garbage collected mid-request
+        self._flush_tasks: set[asyncio.Task] = set()
 
     @property
     def enabled(self) -> bool:
@@ -20,15 +41,29 @@ class HomeAssistantClient:
 
     def _request(self, method: str, endpoint: str, data: dict = None) -> dict | list | None:
         """Make HTTP request to Home Assistant API."""
-        url = f"{self.base_url}{endpoint}"
         try:
-            resp = requests.request(method, url, headers=self.headers, json=data, timeout=10)
+            resp = self._client.request(method, endpoint, json=data)
+            resp.raise_for_status()
+            return resp.json() if resp.content else None
+        except (httpx.HTTPError, ValueError) as e:  # ValueError: non-JSON body (proxy or HA error page)
+            logger.warning("[HA Client] Error: %s", e)
+            return None
+
+    async def _arequest(self, method: str, endpoint: str, data: dict = None) -> dict | list | None:
+        """Async variant of _request, for callers on the event loop."""
+        try:
+            resp = await self._aclient.request(method, endpoint, json=data)
             resp.raise_for_status()
             return resp.json() if resp.content else None
-        except requests.RequestException as e:
-            print(f"[HA Client] Error: {e}")
+        except (httpx.HTTPError, ValueError) as e:  # ValueError: non-JSON body (proxy or HA error page)
+            logger.warning("[HA Client] Error: %s", e)
             return None
 
+    async def aclose(self):
+        """Close the pooled connections (call on application shutdown)."""
+        self._client.close()
+        await self._aclient.aclose()
+
     def check_connection(self) -> dict:
         """Check if Home Assistant is reachable."""
         result = self._request("GET", "/api/")
@@ -36,15 +71,26 @@ class HomeAssistantClient:
             return {"connected": True, "message": result.get("message", "Connected")}
         return {"connected": False, "message": "Cannot connect to Home Assistant"}
 
+    async def acheck_connection(self) -> dict:
+        """Async variant of check_connection."""
+        result = await self._arequest("GET", "/api/")
+        if result:
+            return {"connected": True, "message": result.get("message", "Connected")}
+        return {"connected": False, "message": "Cannot connect to Home Assistant"}
+
     def get_states(self) -> list[dict]:
         """Get all entity states from Home Assistant."""
         return self._request("GET", "/api/states") or []
 
+    async def aget_states(self) -> list[dict]:
+        """Async variant of get_states."""
+        return await self._arequest("GET", "/api/states") or []
+
     def get_state(self, entity_id: str) -> dict | None:
         """Get state of a specific entity."""
         return self._request("GET", f"/api/states/{entity_id}")
 
-    def call_service(self, domain: str, service: str, entity_id: str = None, **data) -> bool:
+    def call_service(self, domain: str, service: str, entity_id: str | list[str] = None, **data) -> bool:
         """Call a Home Assistant service."""
         payload = dict(data)
         if entity_id:
@@ -53,6 +99,62 @@ class HomeAssistantClient:
         result = self._request("POST", f"/api/services/{domain}/{service}", payload)
         return result is not None
 
+    async def acall_service(self, domain: str, service: str, entity_id: str | list[str] = None, **data) -> bool:
+        """Call a Home Assistant service without blocking the event loop."""
+        payload = dict(data)
+        if entity_id:
+            payload["entity_id"] = entity_id
+
+        result = await self._arequest("POST", f"/api/services/{domain}/{service}", payload)
+        return result is not None
+
+    async def acall_service_batched(self, domain: str, service: str, entity_id: str, **data) -> bool:
+        """
+        Like acall_service, but calls with the same service and data issued within
+        BATCH_WINDOW are sent as one request with a list of entity_ids
+        (e.g. a scene turning off several lights).
+        """
+        try:
+            key = (domain, service, tuple(sorted(data.items())))
+            hash(key)
+        except TypeError:
+            return await self.acall_service(domain, service, entity_id, **data)
+
+        batch = self._batches.get(key)
+        if batch is None:
+            loop = asyncio.get_running_loop()
+            task = loop.create_task(self._flush_batch(key))
+            batch = self._batches[key] = ([], loop.create_future(), task)
+            # Kept until done, then the task's outcome goes to the waiters: even a
+            # failure or a cancellation before the task ever ran settles the future
+            self._flush_tasks.add(task)
+            task.add_done_callback(functools.partial(self._finish_batch, key, batch))
+        batch[0].append(entity_id)
+        # Shielded: one caller being cancelled must not cancel the shared result
+        return await asyncio.shield(batch[1])
+
+    async def _flush_batch(self, key: tuple) -> bool:
+        await asyncio.sleep(self.BATCH_WINDOW)
+        entity_ids, _, _ = self._batches.pop(key)  # Calls from here on start a new batch
+        domain, service, data = key
+        target = entity_ids[0] if len(entity_ids) == 1 else entity_ids
+        return await self.acall_service(domain, service, target, **dict(data))
+
+    def _finish_batch(self, key: tuple, batch: tuple, task: asyncio.Task):
+        """Done callback of a flush task: hand its result, error or cancellation to the waiters."""
+        self._flush_tasks.discard(task)
+        if self._batches.get(key) is batch:  # Ended before popping its batch
+            del self._batches[key]
+        done = batch[1]
+        if done.done():
+            return
+        if task.cancelled():
+            done.cancel()
+        elif task.exception() is not None:
+            done.set_exception(task.exception())
+        else:
+            done.set_result(task.result())
+
     # Convenience methods for common device types
     def turn_on_light(self, entity_id: str, brightness_pct: int = None) -> bool:
         """Turn on a light."""
@@ -66,11 +168,14 @@ class HomeAssistantClient:
         return self.call_service("light", "turn_off", entity_id)
 
     def set_climate(self, entity_id: str, temperature: int = None, hvac_mode: str = None) -> bool:
-        """Control climate/AC device."""
-        if hvac_mode:
-            self.call_service("climate", "set_hvac_mode", entity_id, hvac_mode=hvac_mode)
+        """Control climate/AC device in one request (set_temperature also accepts hvac_mode)."""
         if temperature:
-            return self.call_service("climate", "set_temperature", entity_id, temperature=temperature)
+            data = {"temperature": temperature}
+            if hvac_mode:
+                data["hvac_mode"] = hvac_mode
+            return self.call_service("climate", "set_temperature", entity_id, **data)
+        if hvac_mode:
+            return self.call_service("climate", "set_hvac_mode", entity_id, hvac_mode=hvac_mode)
         return True
 
     def turn_off_climate(self, entity_id: str) -> bool:
@@ -98,6 +203,46 @@ class HomeAssistantClient:
         states = self.get_states()
         return [s for s in states if s.get("entity_id", "").startswith(f"{domain}.")]
 
+    # Async variants of the convenience methods, for callers on the event loop
+    # (device tools): concurrent tool calls overlap their requests on the pooled client
+    async def aturn_on_light(self, entity_id: str, brightness_pct: int = None) -> bool:
+        data = {}
+        if brightness_pct is not None:
+            data["brightness_pct"] = brightness_pct
+        return await self.acall_service("light", "turn_on", entity_id, **data)
+
+    async def aturn_off_light(self, entity_id: str) -> bool:
+        return await self.acall_service("light", "turn_off", entity_id)
+
+    async def aset_climate(self, entity_id: str, temperature: int = None, hvac_mode: str = None) -> bool:
+        if temperature:
+            data = {"temperature": temperature}
+            if hvac_mode:
+                data["hvac_mode"] = hvac_mode
+            return await self.acall_service("climate", "set_temperature", entity_id, **data)
+        if hvac_mode:
+            return await self.acall_service("climate", "set_hvac_mode", entity_id, hvac_mode=hvac_mode)
+        return True
+
+    async def aturn_off_climate(self, entity_id: str) -> bool:
+        return await self.acall_service("climate", "turn_off", entity_id)
+
+    async def amedia_play(self, entity_id: str) -> bool:
+        return await self.acall_service("media_player", "media_play", entity_id)
+
+    async def amedia_pause(self, entity_id: str) -> bool:
+        return await self.acall_service("media_player", "media_pause", entity_id)
+
+    async def amedia_stop(self, entity_id: str) -> bool:
+        return await self.acall_service("media_player", "media_stop", entity_id)
+
+    async def aset_volume(self, entity_id: str, volume_level: float) -> bool:
+        return await self.acall_service("media_player", "volume_set", entity_id, volume_level=volume_level)
+
+    async def aget_entities_by_domain(self, domain: str) -> list[dict]:
+        prefix = f"{domain}."
+        return [s for s in await self.aget_states() if s.get("entity_id", "").startswith(prefix)]
+
 
 # Global client instance
 ha_client = HomeAssistantClient()
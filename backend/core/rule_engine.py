@@ -1,15 +1,19 @@
 """
-Rule Engine - Fast path for simple commands.
+Rule Engine - Fast path for simple commands and status questions.
 Pattern matching to bypass LLM for common operations.
 """
+import asyncio
+import functools
 import re
 from dataclasses import dataclass
+from datetime import datetime
 from typing import Callable, Optional
 from core.state_manager import state_manager
+from core.schedule_manager import schedule_manager
 from core.ha_client import ha_client
 
 
-@dataclass
+@dataclass(slots=True)
 class RuleResult:
     matched: bool
     response: str = ""
@@ -23,80 +27,118 @@ class RuleEngine:
     """
 
     def __init__(self):
-        self.rules: list[tuple[re.Pattern, Callable]] = []
+        self.rules: dict[str, Callable] = {}
+        self._master: Optional[re.Pattern] = None
+        self._default_room = "living_room"
+        self._room_map = {
+            "bedroom": "bedroom",
+            "living room": "living_room", "living_room": "living_room",
+            "kitchen": "kitchen",
+            "office": "office",
+            "bathroom": "bathroom",
+            "": self._default_room,
+        }
+        # Display names for replies, computed once for the known rooms
+        self._room_display = {room: room.replace("_", " ").title() for room in set(self._room_map.values())}
         self._register_rules()
 
     def _register_rules(self):
-        """Register pattern matching rules."""
-        # Light control patterns
-        self.rules.append((
-            re.compile(r"^(turn on|open)\s*(.*?)\s*(light|lights?)$", re.I),
-            self._handle_light_on
-        ))
-        self.rules.append((
-            re.compile(r"^(turn off|close)\s*(.*?)\s*(light|lights?)$", re.I),
-            self._handle_light_off
-        ))
-        # AC control patterns
-        self.rules.append((
-            re.compile(r"^(turn on)\s*(.*?)\s*(ac|air\s*con)$", re.I),
-            self._handle_ac_on
-        ))
-        self.rules.append((
-            re.compile(r"^(turn off)\s*(.*?)\s*(ac|air\s*con)$", re.I),
-            self._handle_ac_off
-        ))
-        # Speaker control patterns
-        self.rules.append((
-            re.compile(r"^(pause|stop)\s*(music)?$", re.I),
-            self._handle_speaker_pause
-        ))
-        self.rules.append((
-            re.compile(r"^(play)\s*(music)?$", re.I),
-            self._handle_speaker_play
-        ))
-
-    def process(self, user_input: str) -> RuleResult:
+        """Register pattern matching rules, in priority order."""
+        rules = [
+            # Light control patterns
+            ("light_on", r"(?:turn on|open)\s*(?P<light_on_room>.*?)\s*lights?", self._handle_light_on),
+            ("light_off", r"(?:turn off|close)\s*(?P<light_off_room>.*?)\s*lights?", self._handle_light_off),
+            # AC control patterns
+            ("ac_on", r"turn on\s*(?P<ac_on_room>.*?)\s*(?:ac|air\s*con)", self._handle_ac_on),
+            ("ac_off", r"turn off\s*(?P<ac_off_room>.*?)\s*(?:ac|air\s*con)", self._handle_ac_off),
+            # Speaker control patterns
+            ("speaker_pause", r"(?:pause|stop)\s*(?:music)?", self._handle_speaker_pause),
+            ("speaker_play", r"play\s*(?:music)?", self._handle_speaker_play),
+            # Status questions (answered from local state, no side effects)
+            ("list_schedules",
+             r"(?:(?:show|list|what are)\s+(?:my\s+|all\s+)?(?:schedules?|reminders?|scheduled tasks)"
+             r"|what'?s scheduled|what is scheduled)\??",
+             self._handle_list_schedules),
+            ("all_status",
+             r"(?:(?:show|check|list)\s+(?:all\s+|my\s+)?(?:devices?|device status|status)"
+             r"|(?:device\s+)?status)\??",
+             self._handle_all_status),
+            ("device_status",
+             r"(?:what'?s|what is|is|check)\s+(?:the\s+)?(?P<device_status_room>.*?)\s*"
+             r"(?P<device_status_device>lights?|ac|air\s*con|speaker)"
+             r"\s*(?:status|on|off|brightness|temperature|volume)?\??",
+             self._handle_device_status),
+        ]
+        self.rules = {name: handler for name, _, handler in rules}
+        # One alternation tried in rule order: a single match yields both the
+        # rule (lastgroup, the outermost group) and its captured fields.
+        # Patterns are lowercase; process() lowercases the input once instead of re.I.
+        self._master = re.compile("|".join(f"(?P<{name}>{pattern})" for name, pattern, _ in rules))
+        # Match objects are immutable, so repeated utterances reuse the first match
+        self._match = functools.lru_cache(maxsize=256)(self._master.fullmatch)
+        # Every rule starts with one of these words; anything else skips the regex.
+        # Prefixes rather than whole tokens because patterns allow "playmusic", "status?".
+        self._lead_words = (
+            "turn", "open", "close", "pause", "stop", "play",
+            "show", "list", "what", "is", "check", "status", "device",
+        )
+
+    async def process(self, user_input: str) -> RuleResult:
         """
         Try to match input against rules.
         Returns RuleResult with matched=True if handled, False otherwise.
         """
-        user_input = user_input.strip()
+        text = user_input.strip().lower()
+        if not text.startswith(self._lead_words):
+            return RuleResult(matched=False)  # Cheap reject for free-form queries
 
-        for pattern, handler in self.rules:
-            match = pattern.match(user_input)
-            if match:
-                return handler(match)
+        match = self._match(text)
+        if match:
+            return await self.rules[match.lastgroup](match)
 
         return RuleResult(matched=False)
 
+    def _room_name(self, room: str) -> str:
+        """Display name for a room id, e.g. living_room -> Living Room."""
+        name = self._room_display.get(room)
+        return name if name is not None else room.replace("_", " ").title()
+
     def _parse_room(self, room_str: str) -> str:
-        """Parse room name from input."""
-        room_str = room_str.strip().lower()
-        room_map = {
-            "bedroom": "bedroom",
-            "living room": "living_room", "living_room": "living_room",
-            "kitchen": "kitchen",
-            "office": "office",
-            "bathroom": "bathroom",
-            "": "living_room",  # Default to living room
-        }
-        return room_map.get(room_str, room_str.replace(" ", "_"))
+        """Parse room name from (already lowercased) input; empty means the default room."""
+        room_str = room_str.strip()
+        return self._room_map.get(room_str, room_str.replace(" ", "_"))
+
+    @staticmethod
+    def _already(device_id: str, status: str, **properties) -> bool:
+        """True if the device is already in the requested state, so no HA call is needed."""
+        state = state_manager.get(device_id)
+        return (
+            state is not None
+            and state.status == status
+            and all(getattr(state, k) == v for k, v in properties.items())
+        )
 
-    def _handle_light_on(self, match: re.Match) -> RuleResult:
-        room_str = match.group(2)
+    @staticmethod
+    def _ha_entity(device_id: str) -> str | None:
+        """HA entity to mirror a local change to, or None when HA is off or unmapped."""
+        return state_manager.get_ha_entity_id(device_id) if ha_client.enabled else None
+
+    async def _handle_light_on(self, match: re.Match) -> RuleResult:
+        room_str = match.group("light_on_room")
         room = self._parse_room(room_str)
         device_id = f"light_{room}"
+        if self._already(device_id, "on", brightness=100):
+            room_name = self._room_name(room)
+            return RuleResult(matched=True, response=f"{room_name} light is already on.")
 
         # Update local state
         if state_manager.update(device_id, status="on", properties={"brightness": 100}):
             # Sync to Home Assistant if enabled
-            if ha_client.enabled:
-                entity_id = state_manager.get_ha_entity_id(device_id)
-                if entity_id:
-                    ha_client.call_service("light", "turn_on", entity_id, brightness=255)
+            entity_id = self._ha_entity(device_id)
+            if entity_id:
+                await ha_client.acall_service("light", "turn_on", entity_id, brightness=255)
 
-            room_name = room.replace("_", " ").title()
+            room_name = self._room_name(room)
             return RuleResult(
                 matched=True,
                 response=f"Turned on {room_name} light.",
@@ -105,18 +147,20 @@ class RuleEngine:
 
         return RuleResult(matched=True, response="Device not found.", action_taken=False)
 
-    def _handle_light_off(self, match: re.Match) -> RuleResult:
-        room_str = match.group(2)
+    async def _handle_light_off(self, match: re.Match) -> RuleResult:
+        room_str = match.group("light_off_room")
         room = self._parse_room(room_str)
         device_id = f"light_{room}"
+        if self._already(device_id, "off"):
+            room_name = self._room_name(room)
+            return RuleResult(matched=True, response=f"{room_name} light is already off.")
 
         if state_manager.update(device_id, status="off", properties={"brightness": 0}):
-            if ha_client.enabled:
-                entity_id = state_manager.get_ha_entity_id(device_id)
-                if entity_id:
-                    ha_client.call_service("light", "turn_off", entity_id)
+            entity_id = self._ha_entity(device_id)
+            if entity_id:
+                await ha_client.acall_service("light", "turn_off", entity_id)
 
-            room_name = room.replace("_", " ").title()
+            room_name = self._room_name(room)
             return RuleResult(
                 matched=True,
                 response=f"Turned off {room_name} light.",
@@ -125,18 +169,20 @@ class RuleEngine:
 
         return RuleResult(matched=True, response="Device not found.", action_taken=False)
 
-    def _handle_ac_on(self, match: re.Match) -> RuleResult:
-        room_str = match.group(2)
+    async def _handle_ac_on(self, match: re.Match) -> RuleResult:
+        room_str = match.group("ac_on_room")
         room = self._parse_room(room_str)
         device_id = f"ac_{room}"
+        if self._already(device_id, "on"):
+            room_name = self._room_name(room)
+            return RuleResult(matched=True, response=f"{room_name} AC is already on.")
 
         if state_manager.update(device_id, status="on"):
-            if ha_client.enabled:
-                entity_id = state_manager.get_ha_entity_id(device_id)
-                if entity_id:
-                    ha_client.call_service("climate", "turn_on", entity_id)
+            entity_id = self._ha_entity(device_id)
+            if entity_id:
+                await ha_client.acall_service("climate", "turn_on", entity_id)
 
-            room_name = room.replace("_", " ").title()
+            room_name = self._room_name(room)
             return RuleResult(
                 matched=True,
                 response=f"Turned on {room_name} AC.",
@@ -145,18 +191,20 @@ class RuleEngine:
 
         return RuleResult(matched=True, response="Device not found.", action_taken=False)
 
-    def _handle_ac_off(self, match: re.Match) -> RuleResult:
-        room_str = match.group(2)
+    async def _handle_ac_off(self, match: re.Match) -> RuleResult:
+        room_str = match.group("ac_off_room")
         room = self._parse_room(room_str)
         device_id = f"ac_{room}"
+        if self._already(device_id, "off"):
+            room_name = self._room_name(room)
+            return RuleResult(matched=True, response=f"{room_name} AC is already off.")
 
         if state_manager.update(device_id, status="off"):
-            if ha_client.enabled:
-                entity_id = state_manager.get_ha_entity_id(device_id)
-                if entity_id:
-                    ha_client.call_service("climate", "turn_off", entity_id)
+            entity_id = self._ha_entity(device_id)
+            if entity_id:
+                await ha_client.acall_service("climate", "turn_off", entity_id)
 
-            room_name = room.replace("_", " ").title()
+            room_name = self._room_name(room)
             return RuleResult(
                 matched=True,
                 response=f"Turned off {room_name} AC.",
@@ -165,31 +213,39 @@ class RuleEngine:
 
         return RuleResult(matched=True, response="Device not found.", action_taken=False)
 
-    def _handle_speaker_pause(self, _match: re.Match) -> RuleResult:
-        # Pause all speakers or find the playing one
-        for device_id, state in state_manager.get_all().items():
-            if state["type"] == "speaker" and state["status"] == "on":
-                state_manager.update(device_id, status="off")
-                if ha_client.enabled:
-                    entity_id = state_manager.get_ha_entity_id(device_id)
-                    if entity_id:
-                        ha_client.call_service("media_player", "media_pause", entity_id)
+    async def _handle_speaker_pause(self, _match: re.Match) -> RuleResult:
+        # Pause every playing speaker
+        playing = [
+            device_id for device_id, state in state_manager.get_all().items()
+            if state["type"] == "speaker" and state["status"] == "on"
+        ]
+        now = datetime.now()  # One timestamp for the whole batch of log entries
+        for device_id in playing:
+            state_manager.update(device_id, now=now, status="off")
+        # Coalesced into a single media_pause request for all speakers
+        entity_ids = [e for e in map(self._ha_entity, playing) if e]
+        if entity_ids:
+            await asyncio.gather(*(
+                ha_client.acall_service_batched("media_player", "media_pause", entity_id)
+                for entity_id in entity_ids
+            ))
 
         return RuleResult(
             matched=True,
-            response="Paused.",
-            action_taken=True
+            response="Paused." if playing else "Nothing is playing.",
+            action_taken=bool(playing)
         )
 
-    def _handle_speaker_play(self, _match: re.Match) -> RuleResult:
+    async def _handle_speaker_play(self, _match: re.Match) -> RuleResult:
         # Resume the first speaker found
         for device_id, state in state_manager.get_all().items():
             if state["type"] == "speaker":
+                if state["status"] == "on":
+                    return RuleResult(matched=True, response="Already playing.")
                 state_manager.update(device_id, status="on")
-                if ha_client.enabled:
-                    entity_id = state_manager.get_ha_entity_id(device_id)
-                    if entity_id:
-                        ha_client.call_service("media_player", "media_play", entity_id)
+                entity_id = self._ha_entity(device_id)
+                if entity_id:
+                    await ha_client.acall_service("media_player", "media_play", entity_id)
                 break
 
         return RuleResult(
@@ -198,6 +254,33 @@ class RuleEngine:
             action_taken=True
         )
 
+    async def _handle_list_schedules(self, _match: re.Match) -> RuleResult:
+        _, _, tasks = schedule_manager.get_context().partition("\n")
+        return RuleResult(matched=True, response=tasks)
+
+    async def _handle_all_status(self, _match: re.Match) -> RuleResult:
+        _, _, devices = state_manager.get_context().partition("\n")
+        return RuleResult(matched=True, response=devices or "No devices found.")
+
+    async def _handle_device_status(self, match: re.Match) -> RuleResult:
+        room_str = match.group("device_status_room").strip()
+        device = match.group("device_status_device")
+        device_type = "light" if device.startswith("light") else "speaker" if device == "speaker" else "ac"
+        if room_str:
+            device_id = f"{device_type}_{self._parse_room(room_str)}"
+        else:
+            # No room named ("what is ac?"): only unambiguous with a single device of the type
+            device_ids = state_manager.device_ids(device_type)
+            if len(device_ids) != 1:
+                return RuleResult(matched=False)
+            device_id = device_ids[0]
+        status = state_manager.describe(device_id)
+        if status is None:
+            # The room group takes any text ("what is a smart light?"): only answer
+            # for a known device, let the agent handle everything else
+            return RuleResult(matched=False)
+        return RuleResult(matched=True, response=f"{status}.")
+
 
 # Singleton instance
 rule_engine = RuleEngine()
@@ -5,7 +5,8 @@ from dataclasses import dataclass, field
 from datetime import datetime, timedelta
 from typing import Dict, List, Optional, Any
 from enum import Enum
-import uuid
+import heapq
+import itertools
 
 
 class TaskType(Enum):
@@ -25,7 +26,7 @@ class TaskStatus(Enum):
     CANCELLED = "cancelled"
 
 
-@dataclass
+@dataclass(slots=True)
 class ScheduledTask:
     id: str
     task_type: TaskType
@@ -43,6 +44,13 @@ class ScheduleManager:
 
     def __init__(self):
         self._tasks: Dict[str, ScheduledTask] = {}
+        self.version = 0  # Bumped on every mutation, lets callers cache derived data
+        # Min-heap of (trigger timestamp, task id) for pending tasks. Entries are
+        # invalidated lazily: cancelled/completed/deleted/rescheduled tasks no longer match.
+        self._heap: List[tuple[float, str]] = []
+        self._stale = 0  # Upper bound on dead heap entries; the heap is rebuilt past half
+        self._context_cache: tuple[int, str] | None = None  # (version, rendered get_context)
+        self._ids = itertools.count(1)  # Task ids only need to be unique within this process
 
     def create_task(
         self,
@@ -54,9 +62,37 @@ class ScheduleManager:
         message: str = ""
     ) -> ScheduledTask:
         """Create a new scheduled task."""
-        task_id = str(uuid.uuid4())[:8]
-        task = ScheduledTask(
-            id=task_id,
+        task = self._new_task(task_type, trigger_time, description, repeat, action, message)
+        self._tasks[task.id] = task
+        self._push(task)
+        self.version += 1
+        return task
+
+    def create_tasks_bulk(self, specs: List[Dict[str, Any]]) -> List[ScheduledTask]:
+        """
+        Create several tasks at once; each spec holds create_task's arguments.
+        All specs are validated before any task is added, and the version is
+        bumped once, so derived caches are rebuilt once per batch.
+        """
+        tasks = [self._new_task(**spec) for spec in specs]
+        for task in tasks:
+            self._tasks[task.id] = task
+            self._push(task)
+        if tasks:
+            self.version += 1
+        return tasks
+
+    def _new_task(
+        self,
+        task_type: str,
+        trigger_time: datetime,
+        description: str,
+        repeat: str = "once",
+        action: Dict[str, Any] = None,
+        message: str = ""
+    ) -> ScheduledTask:
+        return ScheduledTask(
+            id=format(next(self._ids), "06x"),
             task_type=TaskType(task_type),
             trigger_time=trigger_time,
             repeat=RepeatType(repeat),
@@ -65,8 +101,29 @@ class ScheduleManager:
             message=message,
             status=TaskStatus.PENDING,
         )
-        self._tasks[task_id] = task
-        return task
+
+    def _push(self, task: ScheduledTask):
+        heapq.heappush(self._heap, (task.trigger_time.timestamp(), task.id))
+
+    def _retire(self):
+        """Count one heap entry as dead, rebuilding the heap once dead entries dominate."""
+        self._stale += 1
+        if self._stale > len(self._heap) // 2:
+            self._compact()
+
+    def _compact(self):
+        """Drop dead entries from the heap."""
+        self._heap = [entry for entry in self._heap if self._live(entry) is not None]
+        heapq.heapify(self._heap)
+        self._stale = 0
+
+    def _live(self, entry: tuple[float, str]) -> Optional[ScheduledTask]:
+        """Task of a heap entry, or None if the entry is stale."""
+        ts, task_id = entry
+        task = self._tasks.get(task_id)
+        if task is not None and task.status == TaskStatus.PENDING and task.trigger_time.timestamp() == ts:
+            return task
+        return None
 
     def get_task(self, task_id: str) -> Optional[ScheduledTask]:
         """Get a task by ID."""
@@ -75,7 +132,12 @@ class ScheduleManager:
     def cancel_task(self, task_id: str) -> bool:
         """Cancel a task."""
         if task_id in self._tasks:
-            self._tasks[task_id].status = TaskStatus.CANCELLED
+            task = self._tasks[task_id]
+            was_pending = task.status == TaskStatus.PENDING
+            task.status = TaskStatus.CANCELLED
+            if was_pending:
+                self._retire()
+            self.version += 1
             return True
         return False
 
@@ -91,6 +153,9 @@ class ScheduleManager:
                     task.trigger_time += timedelta(days=1)
                 elif task.repeat == RepeatType.WEEKLY:
                     task.trigger_time += timedelta(weeks=1)
+                self._push(task)  # The old entry no longer matches and is dropped lazily
+            self._retire()
+            self.version += 1
             return True
         return False
 
@@ -98,13 +163,35 @@ class ScheduleManager:
         """Get all pending tasks."""
         return [t for t in self._tasks.values() if t.status == TaskStatus.PENDING]
 
-    def get_due_tasks(self) -> List[ScheduledTask]:
-        """Get tasks that are due for execution."""
-        now = datetime.now()
-        return [
-            t for t in self._tasks.values()
-            if t.status == TaskStatus.PENDING and t.trigger_time <= now
-        ]
+    def get_due_tasks(self, now: Optional[datetime] = None) -> List[ScheduledTask]:
+        """Get tasks that are due for execution (as of `now`, default the current time)."""
+        now_ts = (now or datetime.now()).timestamp()
+        heap = self._heap
+        # Drop stale entries as they surface at the top
+        while heap and heap[0][0] <= now_ts and self._live(heap[0]) is None:
+            heapq.heappop(heap)
+            self._stale = max(0, self._stale - 1)
+
+        # Walk only the due part of the heap (children never fire earlier than
+        # their parent), so nothing is popped until the caller completes it.
+        due = []
+        stack = [0]
+        while stack:
+            i = stack.pop()
+            if i < len(heap) and heap[i][0] <= now_ts:
+                task = self._live(heap[i])
+                if task is not None:
+                    due.append(task)
+                stack.append(2 * i + 1)
+                stack.append(2 * i + 2)
+        due.sort(key=lambda t: t.trigger_time)
+        return due
+
+    def get_pending_tasks_sorted(self) -> List[ScheduledTask]:
+        """Pending tasks ordered by trigger time, from the heap index."""
+        if self._stale:
+            self._compact()  # Sort only live entries, not ones left by cancelled/completed tasks
+        return [task for task in map(self._live, sorted(self._heap)) if task is not None]
 
     def get_all_tasks(self) -> List[ScheduledTask]:
         """Get all tasks."""
@@ -112,12 +199,18 @@ class ScheduleManager:
 
     def get_context(self) -> str:
         """Generate context string for agent prompt injection."""
-        pending = self.get_pending_tasks()
+        cache = self._context_cache
+        if cache is None or cache[0] != self.version:
+            cache = self._context_cache = (self.version, self._build_context())
+        return cache[1]
+
+    def _build_context(self) -> str:
+        pending = self.get_pending_tasks_sorted()
         if not pending:
             return "[Scheduled Tasks]\nNo scheduled tasks."
 
         lines = ["[Scheduled Tasks]"]
-        for task in sorted(pending, key=lambda t: t.trigger_time):
+        for task in pending:
             time_str = task.trigger_time.strftime("%Y-%m-%d %H:%M")
             repeat_str = f" ({task.repeat.value})" if task.repeat != RepeatType.ONCE else ""
             if task.task_type == TaskType.REMINDER:
@@ -129,7 +222,10 @@ class ScheduleManager:
     def delete_task(self, task_id: str) -> bool:
         """Permanently delete a task."""
         if task_id in self._tasks:
-            del self._tasks[task_id]
+            task = self._tasks.pop(task_id)
+            if task.status == TaskStatus.PENDING:
+                self._retire()
+            self.version += 1
             return True
         return False
 
@@ -1,16 +1,78 @@
+from collections import deque
+from itertools import islice
+from operator import attrgetter
 from dataclasses import dataclass, field
-from typing import Dict, Any
+from typing import Callable, Dict, Any
 from datetime import datetime
 
+import orjson
 
-@dataclass
+
+# Property fields of each device type, in display order (plus "name" for HA devices)
+DEVICE_FIELDS = {
+    "light": ("brightness",),
+    "ac": ("temperature", "mode"),
+    "speaker": ("volume", "playing"),
+}
+_PROPERTY_FIELDS = frozenset({"name", *(f for fields in DEVICE_FIELDS.values() for f in fields)})
+# Keywords in HA entity names mapped to rooms, in priority order
+_ROOM_KEYWORDS = {
+    "bed": "bedroom", "bedroom": "bedroom",
+    "living": "living_room", "living_room": "living_room", "lounge": "living_room",
+    "kitchen": "kitchen",
+    "office": "office", "study": "study",
+    "bathroom": "bathroom", "bath": "bathroom",
+    "garage": "garage",
+    "entrance": "entrance", "hallway": "hallway",
+    "ceiling": "living_room",  # ceiling lights usually in living room
+}
+LOG_SIZE = 1000  # Change log entries kept in memory
+
+# Display names of known rooms in status lines; other rooms show their id
+_ROOM_NAMES = {"bedroom": "Bedroom", "living_room": "Living Room", "kitchen": "Kitchen"}
+
+
+@dataclass(slots=True)
 class DeviceState:
     device_id: str
     device_type: str
     room: str
     status: str
-    properties: Dict[str, Any] = field(default_factory=dict)
+    # Typed fields instead of a generic properties dict; DEVICE_FIELDS says which apply
+    brightness: int | None = None
+    temperature: int | None = None
+    mode: str | None = None
+    volume: int | None = None
+    playing: str | None = None
+    name: str | None = None
     ha_entity_id: str = None  # Home Assistant entity ID mapping
+    _props_str: str | None = field(default=None, init=False, repr=False, compare=False)  # " (k=v, ...)" or ""
+
+    @property
+    def properties(self) -> Dict[str, Any]:
+        """Fields of this device type as a dict (the API shape)."""
+        props = {k: getattr(self, k) for k in DEVICE_FIELDS.get(self.device_type, ())}
+        if self.name is not None:
+            props["name"] = self.name
+        return props
+
+
+def _props_formatter(fields: tuple[str, ...]) -> Callable[[DeviceState], str]:
+    """
+    Build the status-line formatter for one device type: " (k=v, ...)" over
+    its non-None fields, or "". Labels and getters are fixed up front, so
+    rendering never builds the properties dict.
+    """
+    getters = tuple((f"{k}=", attrgetter(k)) for k in (*fields, "name"))
+
+    def fmt(s: DeviceState) -> str:
+        parts = [f"{label}{v}" for label, get in getters if (v := get(s)) is not None]
+        return f" ({', '.join(parts)})" if parts else ""
+    return fmt
+
+
+_PROPS_FORMATTERS = {device_type: _props_formatter(fields) for device_type, fields in DEVICE_FIELDS.items()}
+_name_only = _props_formatter(())  # Unknown device types
 
 
 class StateManager:
@@ -18,8 +80,17 @@ class StateManager:
 
     def __init__(self):
         self._states: Dict[str, DeviceState] = {}
-        self._logs: list = []
+        # Recent changes as (time, device_id, changes), oldest dropped first
+        self._logs: deque[tuple[str, str, dict]] = deque(maxlen=LOG_SIZE)
         self._ha_entity_map: Dict[str, str] = {}  # local_id -> ha_entity_id
+        # (device_type, room) -> (device_id, HA entity_id or None)
+        self._by_type_room: Dict[tuple[str, str], tuple[str, str | None]] = {}
+        self._reindex_hooks: list[Callable[[], None]] = []  # Run whenever the device set is rebuilt
+        self.version = 0  # Bumped on every mutation, lets callers cache derived data
+        self._log_time: tuple[datetime, str] | None = None  # Last log timestamp and its isoformat
+        # (version, value) of derived views, rebuilt only after a mutation
+        self._context_cache: tuple[int, str] | None = None
+        self._json_cache: tuple[int, bytes] | None = None
         self._init_mock_devices()
 
     def _init_mock_devices(self):
@@ -31,14 +102,25 @@ class StateManager:
             ("ac_living_room", "ac", "living_room", "on", {"temperature": 24, "mode": "cool"}),
             ("speaker_living_room", "speaker", "living_room", "off", {"volume": 50, "playing": None}),
         ]
+        self._ha_entity_map.clear()  # Mock devices have no HA entity
         for did, dtype, room, status, props in devices:
-            self._states[did] = DeviceState(did, dtype, room, status, props)
+            self._states[did] = DeviceState(did, dtype, room, status, **props)
+        self._reindex()
+        self.version += 1
 
-    def sync_from_ha(self, ha_client) -> int:
+    async def sync_from_ha(self, ha_client) -> int:
         """Sync device states from Home Assistant. Returns number of devices synced."""
         if not ha_client.enabled:
             return 0
 
+        # /api/states returns every entity: fetch once and split by domain
+        # instead of one full request per domain
+        entities: Dict[str, list] = {"light": [], "climate": [], "media_player": []}
+        for entity in await ha_client.aget_states():
+            domain = entity.get("entity_id", "").partition(".")[0]
+            if domain in entities:
+                entities[domain].append(entity)
+
         self._states.clear()
         self._ha_entity_map.clear()
         count = 0
@@ -53,7 +135,7 @@ class StateManager:
             return f"{base_id}_{i}"
 
         # Sync lights
-        for entity in ha_client.get_entities_by_domain("light"):
+        for entity in entities["light"]:
             entity_id = entity["entity_id"]
             attrs = entity.get("attributes", {})
             friendly_name = attrs.get("friendly_name", entity_id)
@@ -69,14 +151,15 @@ class StateManager:
                 device_type="light",
                 room=room,
                 status=entity["state"],
-                properties={"brightness": brightness, "name": friendly_name},
+                brightness=brightness,
+                name=friendly_name,
                 ha_entity_id=entity_id,
             )
             self._ha_entity_map[local_id] = entity_id
             count += 1
 
         # Sync climate (AC)
-        for entity in ha_client.get_entities_by_domain("climate"):
+        for entity in entities["climate"]:
             entity_id = entity["entity_id"]
             attrs = entity.get("attributes", {})
             friendly_name = attrs.get("friendly_name", entity_id)
@@ -89,18 +172,16 @@ class StateManager:
                 device_type="ac",
                 room=room,
                 status=status,
-                properties={
-                    "temperature": attrs.get("temperature", 26),
-                    "mode": entity["state"] if status == "on" else "off",
-                    "name": friendly_name,
-                },
+                temperature=attrs.get("temperature", 26),
+                mode=entity["state"] if status == "on" else "off",
+                name=friendly_name,
                 ha_entity_id=entity_id,
             )
             self._ha_entity_map[local_id] = entity_id
             count += 1
 
         # Sync media players (speakers)
-        for entity in ha_client.get_entities_by_domain("media_player"):
+        for entity in entities["media_player"]:
             entity_id = entity["entity_id"]
             attrs = entity.get("attributes", {})
             friendly_name = attrs.get("friendly_name", entity_id)
@@ -113,36 +194,38 @@ class StateManager:
                 device_type="speaker",
                 room=room,
                 status=status,
-                properties={
-                    "volume": int(attrs.get("volume_level", 0.5) * 100),
-                    "playing": attrs.get("media_title"),
-                    "name": friendly_name,
-                },
+                volume=int(attrs.get("volume_level", 0.5) * 100),
+                playing=attrs.get("media_title"),
+                name=friendly_name,
                 ha_entity_id=entity_id,
             )
             self._ha_entity_map[local_id] = entity_id
             count += 1
 
+        self._reindex()
+        self.version += 1
         return count
 
+    def _reindex(self):
+        """Rebuild the (type, room) index; the first device of a type in a room wins."""
+        index = self._by_type_room = {}
+        entity_ids = self._ha_entity_map
+        for s in self._states.values():
+            index.setdefault((s.device_type, s.room), (s.device_id, entity_ids.get(s.device_id)))
+        for hook in self._reindex_hooks:
+            hook()
+
+    def on_reindex(self, hook: Callable[[], None]):
+        """Register a callback for when devices or their HA entities are replaced (e.g. to drop lookup caches)."""
+        self._reindex_hooks.append(hook)
+
     def _extract_room(self, entity_id: str, friendly_name: str) -> str:
         """Extract room name from entity_id or friendly_name."""
         name = entity_id.split(".")[-1].lower()
 
-        # Common room name mappings
-        room_mapping = {
-            "bed": "bedroom", "bedroom": "bedroom",
-            "living": "living_room", "living_room": "living_room", "lounge": "living_room",
-            "kitchen": "kitchen",
-            "office": "office", "study": "study",
-            "bathroom": "bathroom", "bath": "bathroom",
-            "garage": "garage",
-            "entrance": "entrance", "hallway": "hallway",
-            "ceiling": "living_room",  # ceiling lights usually in living room
-        }
-
         # Check if entity_id contains room keywords
-        for keyword, room in room_mapping.items():
+        # (the first keyword in table order wins, not the leftmost occurrence)
+        for keyword, room in _ROOM_KEYWORDS.items():
             if keyword in name:
                 return room
 
@@ -152,38 +235,73 @@ class StateManager:
 
     def get_ha_entity_id(self, local_device_id: str) -> str | None:
         """Get Home Assistant entity_id for a local device."""
-        state = self._states.get(local_device_id)
-        return state.ha_entity_id if state else None
+        # Flat map rebuilt by sync_from_ha: one lookup, no DeviceState access
+        return self._ha_entity_map.get(local_device_id)
+
+    def resolve(self, device_type: str, room: str) -> tuple[str | None, str | None]:
+        """
+        (device_id, HA entity_id) of the device of a type in a room (room key,
+        e.g. living_room); (None, None) if there is none.
+        """
+        return self._by_type_room.get((device_type, room), (None, None))
+
+    def device_ids(self, device_type: str) -> list[str]:
+        """Ids of every device of a type."""
+        return [did for did, s in self._states.items() if s.device_type == device_type]
 
     def get(self, device_id: str) -> DeviceState | None:
         return self._states.get(device_id)
 
-    def update(self, device_id: str, **kwargs) -> bool:
+    def update(self, device_id: str, now: datetime | None = None, **kwargs) -> bool:
+        """
+        Apply changes to a device and log them.
+        Callers updating several devices at once can pass one shared `now`.
+        """
         if device_id not in self._states:
             return False
         state = self._states[device_id]
         for k, v in kwargs.items():
             if k == "properties":
-                state.properties.update(v)
+                for name, value in v.items():
+                    if name in _PROPERTY_FIELDS:
+                        setattr(state, name, value)
             elif hasattr(state, k):
                 setattr(state, k, v)
-        self._logs.append({
-            "time": datetime.now().isoformat(),
-            "device": device_id,
-            "changes": kwargs
-        })
+        state._props_str = None
+        self.version += 1
+        self._logs.append((self._isoformat(now or datetime.now()), device_id, kwargs))
         return True
 
+    def _isoformat(self, now: datetime) -> str:
+        """now.isoformat(), reusing the previous string for the same timestamp."""
+        cached = self._log_time
+        if cached is None or cached[0] != now:
+            cached = self._log_time = (now, now.isoformat())
+        return cached[1]
+
+    def describe(self, device_id: str) -> str | None:
+        """One-line status of a single device, or None if it does not exist."""
+        state = self._states.get(device_id)
+        return self._describe(state) if state else None
+
+    @staticmethod
+    def _describe(s: DeviceState) -> str:
+        props = s._props_str
+        if props is None:  # Rendered once per change
+            props = s._props_str = _PROPS_FORMATTERS.get(s.device_type, _name_only)(s)
+        icon = "ON" if s.status == "on" else "OFF"
+        return f"{_ROOM_NAMES.get(s.room, s.room)} {s.device_type}: {icon}{props}"
+
     def get_context(self) -> str:
         """Generate context string for agent prompt injection."""
-        lines = ["[Current Device Status]"]
-        room_map = {"bedroom": "Bedroom", "living_room": "Living Room", "kitchen": "Kitchen"}
-        for s in self._states.values():
-            room_name = room_map.get(s.room, s.room)
-            icon = "ON" if s.status == "on" else "OFF"
-            props = ", ".join(f"{k}={v}" for k, v in s.properties.items() if v is not None)
-            lines.append(f"- {room_name} {s.device_type}: {icon}" + (f" ({props})" if props else ""))
-        return "\n".join(lines)
+        cache = self._context_cache
+        if cache is None or cache[0] != self.version:
+            cache = self._context_cache = (self.version, self._build_context())
+        return cache[1]
+
+    def _build_context(self) -> str:
+        describe = self._describe
+        return "\n".join(["[Current Device Status]", *[f"- {describe(s)}" for s in self._states.values()]])
 
     def get_all(self) -> Dict[str, dict]:
         return {
@@ -196,8 +314,19 @@ class StateManager:
             for did, s in self._states.items()
         }
 
+    def get_all_json(self) -> bytes:
+        """get_all() serialized to JSON, for endpoints that return it unchanged."""
+        cache = self._json_cache
+        if cache is None or cache[0] != self.version:
+            cache = self._json_cache = (self.version, orjson.dumps(self.get_all()))
+        return cache[1]
+
     def get_logs(self, limit: int = 10) -> list:
-        return self._logs[-limit:]
+        logs = self._logs
+        return [
+            {"time": time, "device": device_id, "changes": changes}
+            for time, device_id, changes in islice(logs, max(0, len(logs) - limit), None)
+        ]
 
 
 state_manager = StateManager()
@@ -1,28 +1,49 @@
-from fastapi import FastAPI, HTTPException
+from fastapi import FastAPI, HTTPException, Request
 from fastapi.middleware.cors import CORSMiddleware
-from pydantic import BaseModel
+from fastapi.responses import Response, StreamingResponse
 from contextlib import asynccontextmanager
+from typing import AsyncIterator
+import time
+import orjson
 
 from agents import ButlerAgent
+from bootstrap import init_agentscope, init_logging, stop_logging, close_http_client
 from core import state_manager, schedule_manager, ha_client
 
 
 butler: ButlerAgent | None = None
+# Part of every ETag, so tags from before a restart (when versions start over) never match
+_BOOT_ID = format(time.time_ns(), "x")
+
+
+class OrjsonResponse(Response):
+    """JSON response encoded by orjson (fastapi's own ORJSONResponse is deprecated)."""
+    media_type = "application/json"
+
+    def render(self, content) -> bytes:
+        return orjson.dumps(content)
 
 
 @asynccontextmanager
 async def lifespan(_app: FastAPI):
     global butler
+    init_logging()
+    init_agentscope()
     # Sync devices from Home Assistant if enabled
     if ha_client.enabled:
-        count = state_manager.sync_from_ha(ha_client)
+        count = await state_manager.sync_from_ha(ha_client)
         print(f"[HA] Synced {count} devices from Home Assistant")
     butler = ButlerAgent()
     yield
     butler = None
+    await close_http_client()
+    await ha_client.aclose()
+    stop_logging()
 
 
-app = FastAPI(title="Home Assistant API", lifespan=lifespan)
+# orjson encodes responses; endpoints return OrjsonResponse themselves to also
+# skip FastAPI's jsonable_encoder pass over the payload
+app = FastAPI(title="Home Assistant API", lifespan=lifespan, default_response_class=OrjsonResponse)
 
 app.add_middleware(
     CORSMiddleware,
@@ -33,50 +54,86 @@ app.add_middleware(
 )
 
 
-class ChatRequest(BaseModel):
-    message: str
+async def _read_chat_request(request: Request) -> tuple[str, str | None]:
+    """
+    Parse a {"message": str, "session_id": str | None} body.
+    Two fields do not need a pydantic model: decode with orjson and check types.
+    """
+    try:
+        data = orjson.loads(await request.body())
+    except orjson.JSONDecodeError:
+        raise HTTPException(400, "Invalid JSON body")
+    if not isinstance(data, dict):
+        raise HTTPException(400, "Expected a JSON object")
+    message, session_id = data.get("message"), data.get("session_id")
+    if not isinstance(message, str) or not message.strip():
+        raise HTTPException(400, "Empty message")
+    if session_id is not None and not isinstance(session_id, str):
+        raise HTTPException(400, "session_id must be a string")
+    return message, session_id
+
+
+@app.post("/chat")
+async def chat(request: Request):
+    """Reply as {"response": str, "devices": {...}}."""
+    message, session_id = await _read_chat_request(request)
+    try:
+        response = await butler.chat(message, session_id)
+        # Splice in the cached device JSON instead of re-encoding every device per reply
+        body = b'{"response":%b,"devices":%b}' % (orjson.dumps(response), state_manager.get_all_json())
+        return Response(content=body, media_type="application/json")
+    except Exception as e:
+        raise HTTPException(500, str(e))
 
 
-class ChatResponse(BaseModel):
-    response: str
-    devices: dict
+@app.post("/chat/stream")
+async def chat_stream(request: Request):
+    """Stream the reply as plain text chunks while the model generates it."""
+    message, session_id = await _read_chat_request(request)
+    return StreamingResponse(_stream_reply(butler.chat_stream(message, session_id)), media_type="text/plain; charset=utf-8")
 
 
-@app.post("/chat", response_model=ChatResponse)
-async def chat(req: ChatRequest):
-    if not req.message.strip():
-        raise HTTPException(400, "Empty message")
+async def _stream_reply(chunks: AsyncIterator[str]) -> AsyncIterator[str]:
+    """
+    Pass reply chunks through. The status line is already sent when a failure
+    happens mid-stream, so it ends the stream with an error line instead.
+    """
     try:
-        response = await butler.chat(req.message)
-        return ChatResponse(
-            response=response,
-            devices=state_manager.get_all()
-        )
+        async for chunk in chunks:
+            yield chunk
     except Exception as e:
-        raise HTTPException(500, str(e))
+        yield f"\n[error] {e}"
+    finally:
+        await chunks.aclose()  # On disconnect, close the reply now so it cancels the agent
 
 
 @app.get("/devices")
-async def get_devices():
-    return state_manager.get_all()
+async def get_devices(request: Request):
+    # The state version identifies the device JSON: pollers get a 304 until it changes
+    etag = f'"{_BOOT_ID}-{state_manager.version}"'
+    if_none_match = request.headers.get("if-none-match")
+    if if_none_match and etag in (tag.strip() for tag in if_none_match.split(",")):
+        return Response(status_code=304, headers={"ETag": etag})
+    return Response(content=state_manager.get_all_json(), media_type="application/json", headers={"ETag": etag})
 
 
 @app.get("/schedules")
 async def get_schedules():
     """Get all scheduled tasks."""
     tasks = schedule_manager.get_all_tasks()
-    return [
+    # orjson writes datetimes (ISO 8601) and enums (their value) natively
+    return OrjsonResponse([
         {
             "id": t.id,
-            "type": t.task_type.value,
-            "trigger_time": t.trigger_time.isoformat(),
-            "repeat": t.repeat.value,
+            "type": t.task_type,
+            "trigger_time": t.trigger_time,
+            "repeat": t.repeat,
             "description": t.description,
             "message": t.message,
-            "status": t.status.value,
+            "status": t.status,
         }
         for t in sorted(tasks, key=lambda x: x.trigger_time)
-    ]
+    ])
 
 
 @app.delete("/schedules/{task_id}")
@@ -89,10 +146,9 @@ async def delete_schedule(task_id: str):
 
 @app.post("/reset")
 async def reset():
-    global butler
-    butler = ButlerAgent()
+    await butler.reset()
     if ha_client.enabled:
-        state_manager.sync_from_ha(ha_client)
+        await state_manager.sync_from_ha(ha_client)
     else:
         state_manager._init_mock_devices()
     return {"status": "ok"}
@@ -103,7 +159,7 @@ async def ha_status():
     """Check Home Assistant connection status."""
     if not ha_client.enabled:
         return {"enabled": False, "message": "Home Assistant integration is disabled"}
-    result = ha_client.check_connection()
+    result = await ha_client.acheck_connection()
     return {"enabled": True, **result}
 
 
@@ -112,7 +168,7 @@ async def ha_sync():
     """Manually sync devices from Home Assistant."""
     if not ha_client.enabled:
         raise HTTPException(400, "Home Assistant integration is disabled")
-    count = state_manager.sync_from_ha(ha_client)
+    count = await state_manager.sync_from_ha(ha_client)
     return {"status": "ok", "devices_synced": count}
 
 
@@ -122,8 +178,8 @@ async def ha_entities(domain: str = None):
     if not ha_client.enabled:
         raise HTTPException(400, "Home Assistant integration is disabled")
     if domain:
-        return ha_client.get_entities_by_domain(domain)
-    return ha_client.get_states()
+        return OrjsonResponse(await ha_client.aget_entities_by_domain(domain))
+    return OrjsonResponse(await ha_client.aget_states())
 
 
 if __name__ == "__main__":
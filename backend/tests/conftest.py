@@ -0,0 +1,8 @@
+"""Run the tests against the backend package with HA and the model endpoint offline."""
+import os
+import sys
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+os.environ.setdefault("OPENAI_API_KEY", "test")
+os.environ.setdefault("OPENAI_BASE_URL", "http://127.0.0.1:9/v1")  # Nothing listens: prewarm fails fast
+os.environ["HA_ENABLED"] = "false"
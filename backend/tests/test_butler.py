@@ -0,0 +1,106 @@
+import asyncio
+
+from agents.butler import ButlerAgent
+
+
+def _butler_with_fake_model():
+    """A butler whose model calls are counted instead of sent."""
+    butler = ButlerAgent()
+    calls = []
+
+    async def ask(agent, user_input):
+        calls.append(user_input)
+        return f"answer {len(calls)}"
+
+    butler._ask = ask
+    return butler, calls
+
+
+def test_repeated_question_is_answered_from_cache():
+    async def run():
+        butler, calls = _butler_with_fake_model()
+        first = await butler.chat("what is the weather in paris", "s1")
+        second = await butler.chat("What is the weather in Paris?", "s1")
+        assert first == second == "answer 1"
+        assert calls == ["what is the weather in paris"]
+        # The cached turn is still recorded in the conversation
+        assert await butler._agent_for("s1").memory.size() > 0
+    asyncio.run(run())
+
+
+def test_follow_ups_and_commands_are_not_cached():
+    async def run():
+        butler, calls = _butler_with_fake_model()
+        for text in ("why?", "why?", "and tomorrow?", "and tomorrow?", "is it raining there", "is it raining there"):
+            await butler.chat(text, "s1")
+        await butler.chat("set a timer", "s1")
+        await butler.chat("set a timer", "s1")
+        assert len(calls) == 8
+    asyncio.run(run())
+
+
+def test_cache_is_per_session():
+    async def run():
+        butler, calls = _butler_with_fake_model()
+        await butler.chat("what is the weather in paris", "s1")
+        await butler.chat("what is the weather in paris", "s2")
+        assert len(calls) == 2
+    asyncio.run(run())
+
+
+def test_sessions_are_bounded_least_recently_used_first(monkeypatch):
+    monkeypatch.setattr("agents.butler.MAX_SESSIONS", 3)
+
+    async def run():
+        butler, _ = _butler_with_fake_model()
+        first = butler._agent_for("a")
+        butler._agent_for("b")
+        butler._agent_for("c")
+        assert butler._agent_for("a") is first  # Touching "a" makes "b" the oldest
+        butler._agent_for("d")
+        assert list(butler._sessions) == ["c", "a", "d"]
+        assert butler._agent_for("a") is first
+        for i in range(20):
+            butler._agent_for(f"new-{i}")
+        assert len(butler._sessions) == 3
+    asyncio.run(run())
+
+
+def test_stream_failure_ends_with_error_line():
+    from main import _stream_reply
+
+    async def run():
+        butler, _ = _butler_with_fake_model()
+
+        async def fail(agent, user_input):
+            raise RuntimeError("model unavailable")
+
+        butler._run = fail
+        chunks = [c async for c in _stream_reply(butler.chat_stream("tell me a story", "s1"))]
+        assert chunks == ["\n[error] model unavailable"]
+    asyncio.run(run())
+
+
+def test_closing_the_stream_cancels_the_agent():
+    from main import _stream_reply
+
+    async def run():
+        butler, _ = _butler_with_fake_model()
+        started = asyncio.Event()
+        running = []
+
+        async def hang(agent, user_input):
+            running.append(asyncio.current_task())
+            started.set()
+            await asyncio.sleep(3600)
+
+        butler._run = hang
+        stream = _stream_reply(butler.chat_stream("tell me a story", "s1"))
+        reader = asyncio.create_task(stream.__anext__())
+        await started.wait()
+        reader.cancel()  # What the server does when the client disconnects
+        await asyncio.gather(reader, return_exceptions=True)
+        await stream.aclose()
+        await asyncio.sleep(0)
+        assert running[0].cancelled()
+    asyncio.run(run())
@@ -0,0 +1,68 @@
+import asyncio
+
+import httpx
+
+from core.ha_client import HomeAssistantClient
+
+
+def _client(handler) -> HomeAssistantClient:
+    """A client whose requests are answered by handler instead of the network."""
+    client = HomeAssistantClient()
+    transport = httpx.MockTransport(handler)
+    client._client = httpx.Client(base_url=client.base_url, transport=transport)
+    client._aclient = httpx.AsyncClient(base_url=client.base_url, transport=transport)
+    return client
+
+
+def test_non_json_body_is_an_error_result():
+    client = _client(lambda request: httpx.Response(200, text="<html>502 Bad Gateway</html>"))
+    assert client.get_states() == []
+    assert client.call_service("light", "turn_on", "light.kitchen") is False
+    assert asyncio.run(client.aget_states()) == []
+    assert asyncio.run(client.acall_service("light", "turn_on", "light.kitchen")) is False
+
+
+def test_batched_calls_share_one_request():
+    requests = []
+
+    def handler(request):
+        requests.append(request)
+        return httpx.Response(200, json=[])
+
+    async def run():
+        client = _client(handler)
+        results = await asyncio.gather(*(
+            client.acall_service_batched("light", "turn_off", f"light.{room}") for room in ("a", "b", "c")
+        ))
+        assert results == [True, True, True]
+        assert len(requests) == 1
+        assert not client._batches and not client._flush_tasks
+    asyncio.run(run())
+
+
+def test_batch_failure_reaches_every_waiter():
+    async def run():
+        client = HomeAssistantClient()
+
+        async def broken(*args, **kwargs):
+            raise RuntimeError("boom")
+
+        client.acall_service = broken
+        results = await asyncio.gather(*(
+            client.acall_service_batched("light", "turn_off", f"light.{room}") for room in ("a", "b")
+        ), return_exceptions=True)
+        assert [str(r) for r in results] == ["boom", "boom"]
+        assert not client._batches and not client._flush_tasks
+    asyncio.run(run())
+
+
+def test_cancelled_flush_rejects_waiters():
+    async def run():
+        client = HomeAssistantClient()
+        waiter = asyncio.ensure_future(client.acall_service_batched("light", "turn_off", "light.a"))
+        await asyncio.sleep(0)
+        next(iter(client._flush_tasks)).cancel()
+        results = await asyncio.gather(waiter, return_exceptions=True)
+        assert isinstance(results[0], asyncio.CancelledError)
+        assert not client._batches
+    asyncio.run(run())
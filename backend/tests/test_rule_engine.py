@@ -0,0 +1,28 @@
+import asyncio
+
+from core.rule_engine import rule_engine
+from core.state_manager import state_manager
+
+
+def _process(text: str):
+    return asyncio.run(rule_engine.process(text))
+
+
+def setup_function():
+    state_manager._init_mock_devices()  # Two lights, two ACs, one speaker
+
+
+def test_status_of_a_named_device():
+    result = _process("is the bedroom light on?")
+    assert result.matched and result.response.startswith("Bedroom light: OFF")
+
+
+def test_status_without_room_needs_a_single_device():
+    assert _process("check speaker").matched  # Only one speaker
+    assert not _process("what is ac?").matched  # Two ACs: ask the agent
+    assert not _process("what is the light status").matched
+
+
+def test_status_of_unknown_devices_falls_through():
+    for text in ("what is a smart light?", "is this a good ac?", "check the kitchen light"):
+        assert not _process(text).matched, text
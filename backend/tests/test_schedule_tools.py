@@ -0,0 +1,36 @@
+from datetime import datetime
+
+from tools.schedule_tools import _parse_spec, parse_time_expression
+
+
+def test_padded_datetime_and_clock():
+    assert _parse_spec("2026-01-05 09:00") == ("at", datetime(2026, 1, 5, 9, 0))
+    assert _parse_spec("14:30") == ("today", 14, 30)
+    # Unpadded forms still go through strptime
+    assert _parse_spec("2026-1-5 9:00") == ("at", datetime(2026, 1, 5, 9, 0))
+    assert _parse_spec("9:30") == ("today", 9, 30)
+
+
+def test_out_of_range_falls_back_to_default():
+    for expr in ("2026-13-05 09:00", "2026-02-30 09:00", "24:00", "12:60"):
+        assert _parse_spec(expr) == ("minutes", 10), expr
+
+
+def test_non_ascii_digits_fall_back_to_default():
+    for expr in ("12:3²", "１２:３０", "2026-01-05 09:0²"):
+        assert _parse_spec(expr) == ("minutes", 10), expr
+    parse_time_expression("12:3²")  # Must not raise out of the tool
+
+
+def test_relative_times():
+    assert _parse_spec("in 10 minutes") == ("minutes", 10)
+    assert _parse_spec("in 2 hours") == ("hours", 2)
+    # Hours and minutes add up instead of only the first number counting
+    assert _parse_spec("in 1 hour 30 minutes") == ("minutes", 90)
+    assert _parse_spec("2 hours and 15 minutes") == ("minutes", 135)
+    assert _parse_spec("1 hour 30 mins") == ("minutes", 90)
+    # The number attached to the unit wins over other numbers in the phrase
+    assert _parse_spec("in 2 or 3 minutes") == ("minutes", 3)
+    # No number: defaults
+    assert _parse_spec("in a few minutes") == ("minutes", 10)
+    assert _parse_spec("in an hour") == ("hours", 1)
@@ -1,18 +1,133 @@
+"""
+Device control tools.
+Async so the agent can run several device calls concurrently; Home Assistant
+requests go through the client's pooled async connection.
+"""
+import asyncio
+import sys
+from functools import lru_cache
+
 from agentscope.tool import ToolResponse
 from core.state_manager import state_manager
 from core.ha_client import ha_client
 
-ROOM_ALIAS = {
+# Interned so lookups of canonical room names compare by identity first
+ROOM_ALIAS = {sys.intern(k): sys.intern(v) for k, v in {
     "bedroom": "bedroom", "bed": "bedroom",
     "living_room": "living_room", "livingroom": "living_room", "living": "living_room", "lounge": "living_room",
     "kitchen": "kitchen",
     "study": "study", "office": "office",
     "entrance": "entrance", "hallway": "entrance",
     "bathroom": "bathroom", "bath": "bathroom",
+}.items()}
+
+
+def _canonical_room(room: str) -> str:
+    """Room key for a room as named by the model; unknown names pass through lowercased."""
+    key = room.lower()  # Keys of ROOM_ALIAS are lowercase
+    return ROOM_ALIAS.get(key, key)
+
+
+@lru_cache(maxsize=64)
+def _resolve(device_type: str, room: str) -> tuple[str | None, str | None]:
+    """(device_id, HA entity_id) for a device type in a room as named by the model."""
+    return state_manager.resolve(device_type, _canonical_room(room))
+
+
+# Devices and entity ids change only on reindex (mock reset, HA sync)
+state_manager.on_reindex(_resolve.cache_clear)
+
+
+# Action handlers. entity_id is None when HA is disabled or the device is
+# not mapped, so handlers only update local state in that case.
+
+async def _light_on(room: str, device_id: str, entity_id: str | None, brightness: int | None) -> ToolResponse:
+    br = brightness if brightness else 100
+    if entity_id:
+        await ha_client.aturn_on_light(entity_id, brightness_pct=br)
+    state_manager.update(device_id, status="on", properties={"brightness": br})
+    return ToolResponse(content=f"Light in {room} turned on, brightness {br}%")
+
+
+async def _light_off(room: str, device_id: str, entity_id: str | None, brightness: int | None) -> ToolResponse:
+    if entity_id:
+        await ha_client.aturn_off_light(entity_id)
+    state_manager.update(device_id, status="off", properties={"brightness": 0})
+    return ToolResponse(content=f"Light in {room} turned off")
+
+
+async def _light_dim(room: str, device_id: str, entity_id: str | None, brightness: int | None) -> ToolResponse:
+    br = brightness if brightness else 50
+    if entity_id:
+        await ha_client.aturn_on_light(entity_id, brightness_pct=br)
+    state_manager.update(device_id, status="on", properties={"brightness": br})
+    return ToolResponse(content=f"Light in {room} dimmed to {br}%")
+
+
+async def _ac_on(room: str, device_id: str, entity_id: str | None, temperature: int | None, mode: str | None) -> ToolResponse:
+    props = {"temperature": temperature or 26, "mode": mode or "cool"}
+    if entity_id:
+        await ha_client.aset_climate(entity_id, temperature=props["temperature"], hvac_mode=props["mode"])
+    state_manager.update(device_id, status="on", properties=props)
+    return ToolResponse(content=f"AC in {room} turned on, {props['temperature']}°C, mode: {props['mode']}")
+
+
+async def _ac_off(room: str, device_id: str, entity_id: str | None, temperature: int | None, mode: str | None) -> ToolResponse:
+    if entity_id:
+        await ha_client.aturn_off_climate(entity_id)
+    state_manager.update(device_id, status="off")
+    return ToolResponse(content=f"AC in {room} turned off")
+
+
+async def _ac_set_temp(room: str, device_id: str, entity_id: str | None, temperature: int | None, mode: str | None) -> ToolResponse:
+    if entity_id:
+        await ha_client.aset_climate(entity_id, temperature=temperature)
+    state_manager.update(device_id, properties={"temperature": temperature})
+    return ToolResponse(content=f"AC in {room} set to {temperature}°C")
+
+
+async def _speaker_play(room: str, device_id: str, entity_id: str | None, song: str | None, volume: int | None) -> ToolResponse:
+    track = song or "ambient music"
+    if entity_id:
+        # HA has no play-at-volume service: send both requests at once
+        calls = [ha_client.amedia_play(entity_id)]
+        if volume:
+            calls.append(ha_client.aset_volume(entity_id, volume / 100))
+        await asyncio.gather(*calls)
+    state_manager.update(device_id, status="on", properties={"playing": track, "volume": volume or 50})
+    return ToolResponse(content=f"Now playing: {track}")
+
+
+async def _speaker_pause(room: str, device_id: str, entity_id: str | None, song: str | None, volume: int | None) -> ToolResponse:
+    if entity_id:
+        await ha_client.amedia_pause(entity_id)
+    state_manager.update(device_id, status="off", properties={"playing": None})
+    return ToolResponse(content="Playback stopped")
+
+
+async def _speaker_stop(room: str, device_id: str, entity_id: str | None, song: str | None, volume: int | None) -> ToolResponse:
+    if entity_id:
+        await ha_client.amedia_stop(entity_id)
+    state_manager.update(device_id, status="off", properties={"playing": None})
+    return ToolResponse(content="Playback stopped")
+
+
+async def _speaker_set_volume(room: str, device_id: str, entity_id: str | None, song: str | None, volume: int | None) -> ToolResponse:
+    if entity_id:
+        await ha_client.aset_volume(entity_id, volume / 100)
+    state_manager.update(device_id, properties={"volume": volume})
+    return ToolResponse(content=f"Volume set to {volume}%")
+
+
+# Action name -> handler, one table per device type
+_LIGHT_ACTIONS = {"turn_on": _light_on, "turn_off": _light_off, "dim": _light_dim}
+_AC_ACTIONS = {"turn_on": _ac_on, "turn_off": _ac_off, "set_temp": _ac_set_temp}
+_SPEAKER_ACTIONS = {
+    "play": _speaker_play, "pause": _speaker_pause, "stop": _speaker_stop, "set_volume": _speaker_set_volume,
 }
 
 
-def control_light(room: str, action: str, brightness: int = None) -> ToolResponse:
+async def control_light(room: str, action: str, brightness: int = None) -> ToolResponse:
     """
     Control light device.
 
@@ -21,34 +136,16 @@ def control_light(room: str, action: str, brightness: int = None) -> ToolRespons
         action: turn_on, turn_off, or dim
         brightness: 0-100, required for dim action
     """
-    room_key = ROOM_ALIAS.get(room.lower(), room.lower())
-    device_id = f"light_{room_key}"
-    entity_id = state_manager.get_ha_entity_id(device_id)
-
-    if action == "turn_on":
-        br = brightness if brightness else 100
-        if ha_client.enabled and entity_id:
-            ha_client.turn_on_light(entity_id, brightness_pct=br)
-        state_manager.update(device_id, status="on", properties={"brightness": br})
-        return ToolResponse(content=f"Light in {room} turned on, brightness {br}%")
-
-    elif action == "turn_off":
-        if ha_client.enabled and entity_id:
-            ha_client.turn_off_light(entity_id)
-        state_manager.update(device_id, status="off", properties={"brightness": 0})
-        return ToolResponse(content=f"Light in {room} turned off")
-
-    elif action == "dim":
-        br = brightness if brightness else 50
-        if ha_client.enabled and entity_id:
-            ha_client.turn_on_light(entity_id, brightness_pct=br)
-        state_manager.update(device_id, status="on", properties={"brightness": br})
-        return ToolResponse(content=f"Light in {room} dimmed to {br}%")
-
-    return ToolResponse(content=f"Unknown action: {action}")
-
-
-def control_ac(room: str, action: str, temperature: int = None, mode: str = None) -> ToolResponse:
+    device_id, entity_id = _resolve("light", room)
+    if device_id is None:
+        return ToolResponse(content=f"No light in {room}")
+    handler = _LIGHT_ACTIONS.get(action)
+    if handler is None:
+        return ToolResponse(content=f"Unknown action: {action}")
+    return await handler(room, device_id, entity_id if ha_client.enabled else None, brightness)
+
+
+async def control_ac(room: str, action: str, temperature: int = None, mode: str = None) -> ToolResponse:
     """
     Control air conditioner.
 
@@ -58,33 +155,16 @@ def control_ac(room: str, action: str, temperature: int = None, mode: str = None
         temperature: 16-30
         mode: cool, heat, or auto
     """
-    room_key = ROOM_ALIAS.get(room.lower(), room.lower())
-    device_id = f"ac_{room_key}"
-    entity_id = state_manager.get_ha_entity_id(device_id)
-
-    if action == "turn_on":
-        props = {"temperature": temperature or 26, "mode": mode or "cool"}
-        if ha_client.enabled and entity_id:
-            ha_client.set_climate(entity_id, temperature=props["temperature"], hvac_mode=props["mode"])
-        state_manager.update(device_id, status="on", properties=props)
-        return ToolResponse(content=f"AC in {room} turned on, {props['temperature']}°C, mode: {props['mode']}")
-
-    elif action == "turn_off":
-        if ha_client.enabled and entity_id:
-            ha_client.turn_off_climate(entity_id)
-        state_manager.update(device_id, status="off")
-        return ToolResponse(content=f"AC in {room} turned off")
+    device_id, entity_id = _resolve("ac", room)
+    if device_id is None:
+        return ToolResponse(content=f"No AC in {room}")
+    handler = _AC_ACTIONS.get(action)
+    if handler is None:
+        return ToolResponse(content=f"Unknown action: {action}")
+    return await handler(room, device_id, entity_id if ha_client.enabled else None, temperature, mode)
 
-    elif action == "set_temp":
-        if ha_client.enabled and entity_id:
-            ha_client.set_climate(entity_id, temperature=temperature)
-        state_manager.update(device_id, properties={"temperature": temperature})
-        return ToolResponse(content=f"AC in {room} set to {temperature}°C")
 
-    return ToolResponse(content=f"Unknown action: {action}")
-
-
-def control_speaker(room: str, action: str, song: str = None, volume: int = None) -> ToolResponse:
+async def control_speaker(room: str, action: str, song: str = None, volume: int = None) -> ToolResponse:
     """
     Control speaker/music player.
 
@@ -94,35 +174,16 @@ def control_speaker(room: str, action: str, song: str = None, volume: int = None
         song: Song or playlist name
         volume: 0-100
     """
-    room_key = ROOM_ALIAS.get(room.lower(), room.lower())
-    device_id = f"speaker_{room_key}"
-    entity_id = state_manager.get_ha_entity_id(device_id)
-
-    if action == "play":
-        track = song or "ambient music"
-        if ha_client.enabled and entity_id:
-            ha_client.media_play(entity_id)
-            if volume:
-                ha_client.set_volume(entity_id, volume / 100)
-        state_manager.update(device_id, status="on", properties={"playing": track, "volume": volume or 50})
-        return ToolResponse(content=f"Now playing: {track}")
-
-    elif action in ("pause", "stop"):
-        if ha_client.enabled and entity_id:
-            ha_client.media_stop(entity_id) if action == "stop" else ha_client.media_pause(entity_id)
-        state_manager.update(device_id, status="off", properties={"playing": None})
-        return ToolResponse(content="Playback stopped")
-
-    elif action == "set_volume":
-        if ha_client.enabled and entity_id:
-            ha_client.set_volume(entity_id, volume / 100)
-        state_manager.update(device_id, properties={"volume": volume})
-        return ToolResponse(content=f"Volume set to {volume}%")
-
-    return ToolResponse(content=f"Unknown action: {action}")
-
-
-def get_device_status(room: str = None) -> ToolResponse:
+    device_id, entity_id = _resolve("speaker", room)
+    if device_id is None:
+        return ToolResponse(content=f"No speaker in {room}")
+    handler = _SPEAKER_ACTIONS.get(action)
+    if handler is None:
+        return ToolResponse(content=f"Unknown action: {action}")
+    return await handler(room, device_id, entity_id if ha_client.enabled else None, song, volume)
+
+
+async def get_device_status(room: str = None) -> ToolResponse:
     """
     Query current device status.
 
@@ -1,65 +1,147 @@
 """
 Schedule tools for creating, managing, and querying scheduled tasks.
 """
+import io
+import re
 from datetime import datetime, timedelta
+from functools import lru_cache
+
+import orjson
 from agentscope.tool import ToolResponse
 from core.schedule_manager import schedule_manager
 
+_TIME_RE = re.compile(r'(\d{1,2}):?(\d{2})?')  # "9", "9:30", "930"
+_DIGITS_RE = re.compile(r'\d+')
+# Number before an hour/minute unit, for phrases that name "hour" or "minute"
+_HOURS_RE = re.compile(r'(\d+)\s*h(?:(?:ou)?rs?)?\b')  # "2 hours", "1 hr", "3h"
+_MINUTES_RE = re.compile(r'(\d+)\s*m(?:in(?:ute)?s?)?\b')  # "30 minutes", "5 mins", "10m"
+
 
 def parse_time_expression(time_expr: str) -> datetime:
     """
     Parse various time expressions into datetime.
     Supports: "10 minutes", "1 hour", "2023-12-25 14:00", "tomorrow 9:00", etc.
     """
-    time_expr = time_expr.lower().strip()
+    kind, *args = _parse_spec(time_expr.lower().strip())
     now = datetime.now()
 
-    # Relative time: "in X minutes/hours"
+    if kind == "minutes":
+        return now + timedelta(minutes=args[0])
+    if kind == "hours":
+        return now + timedelta(hours=args[0])
+    if kind == "at":
+        return args[0]
+    day = now + timedelta(days=1) if kind == "tomorrow" else now
+    return day.replace(hour=args[0], minute=args[1], second=0, microsecond=0)
+
+
+@lru_cache(maxsize=256)
+def _parse_spec(time_expr: str) -> tuple:
+    """
+    Parse a normalized time expression into a spec that does not depend on the
+    current time, so repeated expressions skip parsing:
+    ("minutes", n), ("hours", n), ("tomorrow", hour, minute),
+    ("today", hour, minute) or ("at", datetime).
+    """
+    # Relative time: "in X minutes/hours", "in 1 hour 30 minutes"
+    if "minute" in time_expr or "hour" in time_expr:
+        hours, minutes = _HOURS_RE.search(time_expr), _MINUTES_RE.search(time_expr)
+        if hours and minutes:  # Both units: add them up
+            return "minutes", int(hours.group(1)) * 60 + int(minutes.group(1))
+        if minutes:
+            return "minutes", int(minutes.group(1))
+        if hours:
+            return "hours", int(hours.group(1))
+    # No number next to the unit: take the first number, if any
     if "minute" in time_expr:
-        minutes = int(''.join(filter(str.isdigit, time_expr)) or 10)
-        return now + timedelta(minutes=minutes)
+        digits = _DIGITS_RE.search(time_expr)
+        return "minutes", int(digits.group()) if digits else 10
     elif "hour" in time_expr:
-        hours = int(''.join(filter(str.isdigit, time_expr)) or 1)
-        return now + timedelta(hours=hours)
+        digits = _DIGITS_RE.search(time_expr)
+        return "hours", int(digits.group()) if digits else 1
 
     # Tomorrow
     if "tomorrow" in time_expr:
         # Extract time if present
-        import re
-        time_match = re.search(r'(\d{1,2}):?(\d{2})?', time_expr)
+        time_match = _TIME_RE.search(time_expr)
         if time_match:
-            hour = int(time_match.group(1))
-            minute = int(time_match.group(2) or 0)
-        else:
-            hour, minute = 9, 0  # Default to 9:00
-        tomorrow = now + timedelta(days=1)
-        return tomorrow.replace(hour=hour, minute=minute, second=0, microsecond=0)
+            return "tomorrow", int(time_match.group(1)), int(time_match.group(2) or 0)
+        return "tomorrow", 9, 0  # Default to 9:00
 
     # Today with time
     if "today" in time_expr:
-        import re
-        time_match = re.search(r'(\d{1,2}):?(\d{2})?', time_expr)
+        time_match = _TIME_RE.search(time_expr)
         if time_match:
-            hour = int(time_match.group(1))
-            minute = int(time_match.group(2) or 0)
-            return now.replace(hour=hour, minute=minute, second=0, microsecond=0)
+            return "today", int(time_match.group(1)), int(time_match.group(2) or 0)
+
+    # Absolute datetime: "2023-12-25 14:00" or "14:00".
+    # The zero-padded layouts are sliced directly; strptime (slow, and reports a
+    # mismatch by raising) is only tried for other text with the right separators.
+    if len(time_expr) == 16 and _is_full_datetime(time_expr):
+        try:
+            return "at", datetime(
+                int(time_expr[0:4]), int(time_expr[5:7]), int(time_expr[8:10]),
+                int(time_expr[11:13]), int(time_expr[14:16]),
+            )
+        except ValueError:  # Out of range, e.g. month 13
+            pass
+    elif len(time_expr) == 5 and _is_clock(time_expr):
+        hour, minute = int(time_expr[0:2]), int(time_expr[3:5])
+        if hour < 24 and minute < 60:
+            return "today", hour, minute
+    elif "-" in time_expr:
+        try:
+            # Try full datetime, e.g. unpadded "2023-1-5 9:00"
+            return "at", datetime.strptime(time_expr, "%Y-%m-%d %H:%M")
+        except ValueError:
+            pass
+    elif ":" in time_expr:
+        try:
+            # Try time only (today), e.g. "9:30"
+            time_obj = datetime.strptime(time_expr, "%H:%M")
+            return "today", time_obj.hour, time_obj.minute
+        except ValueError:
+            pass
+
+    # Default: 10 minutes from now
+    return "minutes", 10
 
-    # Absolute datetime: "2023-12-25 14:00" or "14:00"
+
+def _parse_params(parameters: str | None) -> dict:
+    """Decode a JSON object of device parameters; anything else yields {}."""
+    # Only attempt to decode things that look like a JSON object
+    if not parameters or parameters.lstrip()[:1] != "{":
+        return {}
     try:
-        # Try full datetime
-        return datetime.strptime(time_expr, "%Y-%m-%d %H:%M")
-    except ValueError:
-        pass
+        params = orjson.loads(parameters)
+    except orjson.JSONDecodeError:
+        return {}
+    return params if isinstance(params, dict) else {}
+
 
+def _parse_items(items: str) -> list[dict] | None:
+    """Decode a JSON list of objects, or None if it is anything else."""
     try:
-        # Try time only (today)
-        time_obj = datetime.strptime(time_expr, "%H:%M")
-        return now.replace(hour=time_obj.hour, minute=time_obj.minute, second=0, microsecond=0)
-    except ValueError:
-        pass
+        data = orjson.loads(items)
+    except orjson.JSONDecodeError:
+        return None
+    if not isinstance(data, list) or not all(isinstance(item, dict) for item in data):
+        return None
+    return data
 
-    # Default: 10 minutes from now
-    return now + timedelta(minutes=10)
+
+# isdigit() alone also accepts "²" (which int() rejects) and full-width digits
+# (which strptime rejects): the fast paths only take ASCII, as strptime does.
+
+def _is_full_datetime(s: str) -> bool:
+    """Whether a 16-char string has the "YYYY-MM-DD HH:MM" layout."""
+    return (s.isascii() and s[4] == "-" and s[7] == "-" and s[10] == " " and s[13] == ":"
+            and (s[0:4] + s[5:7] + s[8:10] + s[11:13] + s[14:16]).isdigit())
+
+
+def _is_clock(s: str) -> bool:
+    """Whether a 5-char string has the "HH:MM" layout."""
+    return s.isascii() and s[2] == ":" and s[0:2].isdigit() and s[3:5].isdigit()
 
 
 def create_reminder(
@@ -111,21 +193,13 @@ def create_device_schedule(
         repeat: Frequency - "once", "daily", or "weekly"
         parameters: JSON string of additional parameters (brightness, temperature, etc.)
     """
-    import json
     trigger_time = parse_time_expression(time)
 
-    params = {}
-    if parameters:
-        try:
-            params = json.loads(parameters)
-        except json.JSONDecodeError:
-            pass
-
     action_dict = {
         "device_type": device_type,
         "room": room,
         "action": action,
-        **params
+        **_parse_params(parameters)
     }
 
     task = schedule_manager.create_task(
@@ -142,23 +216,102 @@ def create_device_schedule(
     )
 
 
+def create_reminders_batch(items: str) -> ToolResponse:
+    """
+    Create several reminders in one call.
+
+    Args:
+        items: JSON list of reminders, each {"message": ..., "time": ..., "repeat": "once"}
+    """
+    data = _parse_items(items)
+    if not data:
+        return ToolResponse(content="Expected a non-empty JSON list of reminders.")
+    specs = [
+        {
+            "task_type": "reminder",
+            "trigger_time": parse_time_expression(str(item.get("time", ""))),
+            "description": f"Reminder: {item.get('message', '')}",
+            "repeat": item.get("repeat") or "once",
+            "message": str(item.get("message", "")),
+        }
+        for item in data
+    ]
+    try:
+        tasks = schedule_manager.create_tasks_bulk(specs)
+    except ValueError as e:  # Unknown repeat value: nothing was created
+        return ToolResponse(content=f"No reminders created: {e}")
+    return ToolResponse(content="\n".join([
+        f"Created {len(tasks)} reminder{'s' if len(tasks) != 1 else ''}:",
+        *[
+            f"- {task.trigger_time.strftime('%Y-%m-%d %H:%M')}"
+            f"{f' (repeats {task.repeat.value})' if task.repeat.value != 'once' else ''}: "
+            f"{task.message} [ID: {task.id}]"
+            for task in tasks
+        ],
+    ]))
+
+
+def create_device_schedules_batch(items: str) -> ToolResponse:
+    """
+    Schedule several device actions in one call.
+
+    Args:
+        items: JSON list of schedules, each {"description", "time", "device_type", "room",
+            "action", "repeat" (optional), "parameters" (optional object of brightness, temperature, etc.)}
+    """
+    data = _parse_items(items)
+    if not data:
+        return ToolResponse(content="Expected a non-empty JSON list of schedules.")
+    specs = []
+    for item in data:
+        params = item.get("parameters")
+        if isinstance(params, str):
+            params = _parse_params(params)
+        specs.append({
+            "task_type": "device_control",
+            "trigger_time": parse_time_expression(str(item.get("time", ""))),
+            "description": str(item.get("description", "")),
+            "repeat": item.get("repeat") or "once",
+            "action": {
+                "device_type": item.get("device_type"),
+                "room": item.get("room"),
+                "action": item.get("action"),
+                **(params if isinstance(params, dict) else {}),
+            },
+        })
+    try:
+        tasks = schedule_manager.create_tasks_bulk(specs)
+    except ValueError as e:  # Unknown repeat value: nothing was created
+        return ToolResponse(content=f"No schedules created: {e}")
+    return ToolResponse(content="\n".join([
+        f"Scheduled {len(tasks)} task{'s' if len(tasks) != 1 else ''}:",
+        *[
+            f"- {task.description} at {task.trigger_time.strftime('%Y-%m-%d %H:%M')}"
+            f"{f' (repeats {task.repeat.value})' if task.repeat.value != 'once' else ''} [ID: {task.id}]"
+            for task in tasks
+        ],
+    ]))
+
+
 def list_schedules() -> ToolResponse:
     """
     List all pending scheduled tasks and reminders.
     """
-    tasks = schedule_manager.get_pending_tasks()
+    tasks = schedule_manager.get_pending_tasks_sorted()  # Already in trigger order
     if not tasks:
         return ToolResponse(content="No scheduled tasks or reminders.")
 
-    lines = ["Scheduled tasks:"]
-    for task in sorted(tasks, key=lambda t: t.trigger_time):
-        time_str = task.trigger_time.strftime("%m-%d %H:%M")
-        repeat_str = f" [{task.repeat.value}]" if task.repeat.value != "once" else ""
-        if task.task_type.value == "reminder":
-            lines.append(f"- {time_str}{repeat_str}: Reminder - {task.message} (ID: {task.id})")
-        else:
-            lines.append(f"- {time_str}{repeat_str}: {task.description} (ID: {task.id})")
-    return ToolResponse(content="\n".join(lines))
+    # Write each line straight into one buffer instead of collecting them for a join
+    buf = io.StringIO()
+    buf.write("Scheduled tasks:")
+    for task in tasks:
+        buf.write(
+            f"\n- {task.trigger_time.strftime('%m-%d %H:%M')}"
+            f"{f' [{task.repeat.value}]' if task.repeat.value != 'once' else ''}: "
+            f"{f'Reminder - {task.message}' if task.task_type.value == 'reminder' else task.description}"
+            f" (ID: {task.id})"
+        )
+    return ToolResponse(content=buf.getvalue())
 
 
 def cancel_schedule(task_id: str) -> ToolResponse:
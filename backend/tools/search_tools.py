@@ -1,6 +1,10 @@
 """
 Search tools for querying external information using DuckDuckGo.
 """
+import asyncio
+import threading
+import time
+
 from agentscope.tool import ToolResponse
 
 try:
@@ -9,6 +13,47 @@ try:
 except ImportError:
     DDGS_AVAILABLE = False
 
+_ddgs: "DDGS | None" = None
+_ddgs_lock = threading.Lock()
+
+
+def _get_ddgs() -> "DDGS":
+    """
+    Shared DDGS client, created on first search.
+    Reusing it keeps its HTTP connection (and cookies) warm between searches
+    instead of a new TLS handshake per query.
+    """
+    global _ddgs
+    if _ddgs is None:
+        with _ddgs_lock:  # Searches run in worker threads
+            if _ddgs is None:
+                _ddgs = DDGS()
+    return _ddgs
+
+
+# Recent result texts per (normalized query, max_results), so retries and
+# follow-up questions do not hit DuckDuckGo again; insertion order is age
+_SEARCH_CACHE_TTL = 300.0  # seconds
+_SEARCH_CACHE_SIZE = 128
+_web_cache: dict[tuple[str, int], tuple[float, str]] = {}
+_news_cache: dict[tuple[str, int], tuple[float, str]] = {}
+_cache_lock = threading.Lock()
+
+
+def _cache_get(cache: dict, key: tuple[str, int]) -> str | None:
+    entry = cache.get(key)
+    if entry is not None and entry[0] > time.monotonic():
+        return entry[1]
+    return None
+
+
+def _cache_put(cache: dict, key: tuple[str, int], text: str):
+    with _cache_lock:
+        cache.pop(key, None)
+        if len(cache) >= _SEARCH_CACHE_SIZE:
+            del cache[next(iter(cache))]  # Evict the oldest entry
+        cache[key] = (time.monotonic() + _SEARCH_CACHE_TTL, text)
+
 
 def web_search(query: str, max_results: int = 5) -> ToolResponse:
     """
@@ -27,12 +72,18 @@ def web_search(query: str, max_results: int = 5) -> ToolResponse:
                     "Run: pip install duckduckgo-search"
         )
 
+    key = (query.lower().strip(), max_results)
+    cached = _cache_get(_web_cache, key)
+    if cached is not None:
+        return ToolResponse(content=cached)
+
     try:
-        with DDGS() as ddgs:
-            results = list(ddgs.text(query, max_results=max_results))
+        results = list(_get_ddgs().text(query, max_results=max_results))
 
         if not results:
-            return ToolResponse(content=f"No results found for: {query}")
+            text = f"No results found for: {query}"
+            _cache_put(_web_cache, key, text)
+            return ToolResponse(content=text)
 
         # Format results
         formatted = []
@@ -43,7 +94,9 @@ def web_search(query: str, max_results: int = 5) -> ToolResponse:
                 f"   URL: {r.get('href', 'No URL')}"
             )
 
-        return ToolResponse(content="\n\n".join(formatted))
+        text = "\n\n".join(formatted)
+        _cache_put(_web_cache, key, text)
+        return ToolResponse(content=text)
 
     except Exception as e:
         return ToolResponse(content=f"Search error: {str(e)}")
@@ -65,12 +118,18 @@ def search_news(query: str, max_results: int = 5) -> ToolResponse:
             content="Search unavailable: duckduckgo-search package not installed."
         )
 
+    key = (query.lower().strip(), max_results)
+    cached = _cache_get(_news_cache, key)
+    if cached is not None:
+        return ToolResponse(content=cached)
+
     try:
-        with DDGS() as ddgs:
-            results = list(ddgs.news(query, max_results=max_results))
+        results = list(_get_ddgs().news(query, max_results=max_results))
 
         if not results:
-            return ToolResponse(content=f"No news found for: {query}")
+            text = f"No news found for: {query}"
+            _cache_put(_news_cache, key, text)
+            return ToolResponse(content=text)
 
         formatted = []
         for i, r in enumerate(results, 1):
@@ -81,7 +140,28 @@ def search_news(query: str, max_results: int = 5) -> ToolResponse:
                 f"   Source: {r.get('source', 'Unknown')}"
             )
 
-        return ToolResponse(content="\n\n".join(formatted))
+        text = "\n\n".join(formatted)
+        _cache_put(_news_cache, key, text)
+        return ToolResponse(content=text)
 
     except Exception as e:
         return ToolResponse(content=f"News search error: {str(e)}")
+
+
+async def web_and_news_search(query: str, max_results: int = 5) -> ToolResponse:
+    """
+    Search the web and news for the same topic at once.
+
+    Args:
+        query: The search query (e.g., "AI regulation", "local election")
+        max_results: Maximum number of results per section (default 5)
+
+    Returns:
+        Web results followed by news results
+    """
+    # Both searches block on the network: run them side by side in worker threads
+    web, news = await asyncio.gather(
+        asyncio.to_thread(web_search, query, max_results),
+        asyncio.to_thread(search_news, query, max_results),
+    )
+    return ToolResponse(content=f"Web results:\n{web.content}\n\nNews results:\n{news.content}")